@@ -1,5 +1,12 @@
+import os
 import subprocess
 import sys
 
+from dashboard_timing import TIMINGS_ENV
+
 if __name__ == "__main__":
-    subprocess.run([sys.executable, "-m", "streamlit", "run", "url5.py"])
+    env = dict(os.environ)
+    # --timings: Startup-Report (Imports, Laden, Indizes, erster Render) ins Server-Log schreiben
+    if "--timings" in sys.argv[1:]:
+        env[TIMINGS_ENV] = "1"
+    subprocess.run([sys.executable, "-m", "streamlit", "run", "url5.py"], env=env)
@@ -0,0 +1,1452 @@
+"""Data loading for the CSRD Benchmarking Dashboard.
+
+Everything in here is independent of Streamlit so that it can be reused by
+offline tooling. ``url5.py`` wraps the loader with ``st.cache_resource`` so the
+frame is parsed once per process and file version and shared by all sessions.
+
+The CSV can be compiled into a columnar Arrow IPC artifact holding the
+cleaned data::
+
+    python dashboard_data.py compile
+
+``load_dataset`` memory-maps that artifact and only falls back to parsing the
+CSV when the artifact is missing or was built from a different CSV. Derived
+columns come from the ``DERIVED_COLUMNS`` registry and are added on load.
+
+New reports are delivered as delta CSVs in ``updates/`` next to the data file.
+``DatasetStore`` merges them into the running process by ``isin``/``srn_id``
+without a restart.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+DATA_FILE = "merged_550_from_450_and_update.csv"
+# Neue Berichte kommen als Delta-CSVs (gleiche Spalten, Schlüssel isin bzw. srn_id)
+# in diesen Ordner neben DATA_FILE und werden nach Dateinamen sortiert eingespielt
+DELTA_DIR = "updates"
+
+# Schema-Metadaten des Artefakts: Hash der CSV, aus der es gebaut wurde, und
+# Stand der Bereinigung (siehe artifact_format)
+ARTIFACT_SOURCE_KEY = b"dashboard_source_sha256"
+ARTIFACT_FORMAT_KEY = b"dashboard_format"
+# Erhöhen, wenn clean_frame anders bereinigt – dtypes und Mappings zählen automatisch
+ARTIFACT_FORMAT_VERSION = 1
+
+# Explizite dtypes statt Typ-Inferenz bei jedem Einlesen
+CSV_DTYPES = {
+    "country":        "category",
+    "auditor":        "category",
+    "Market_Cap_Cat": "Int8",
+}
+
+# Diese Spalten werden erst nach der Bereinigung zu Kategorien
+CATEGORY_COLUMNS = ["SASB industry", "supersector"]
+
+# Spalten, nach denen Peer-Gruppen gebildet werden
+PEER_KEYS = ["supersector", "SASB industry", "country", "Market_Cap_Cat", "cap_group"]
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One scalar metric view: column, axis label, d3 number format and help text."""
+    view: str
+    column: str
+    label: str
+    fmt: str
+    title: str = None
+    help: str = ""
+
+    @property
+    def heading(self) -> str:
+        return self.title or self.view
+
+
+# Registry der Kennzahl-Views – eine neue Kennzahl = eine Zeile hier
+METRICS = {m.view: m for m in [
+    Metric("Number of Pages", "Sustainability_Page_Count", "Pages", ".0f",
+           help="The total number of pages of the sustainability report."),
+    Metric("Number of Words", "words", "Words", ".0f",
+           help="The total number of words of the sustainability report."),
+    Metric("Number of Norm Pages", "norm_pages", "Norm Pages", ".2f",
+           help="Number of Norm Pages converts each text's total word count into standardized 500-word pages. A value of 2.5 means the document contains the equivalent of 2½ standard pages."),
+    Metric("Numbers", "nums_500", "Numbers per Norm Page", ".2f", title="Numbers per Norm Page",
+           help="Count of Numbers per Norm Page. A norm page is a standardized 500-word page."),
+    Metric("Tables", "tables_500", "Tables per Norm Page", ".2f", title="Tables per Norm Page",
+           help="Count of tables per Norm Page. A norm page is a standardized 500-word page."),
+    Metric("Images", "imgsize", "Image per Page", ".3f", title="Image Size per Norm Page",
+           help="Average image area per Norm Page. A norm page is a standardized 500-word page."),
+    Metric("Standardized Language", "boilergrams_500", "Tetragrams per Norm Page", ".2f",
+           help="Standardized language measures how often a company relies on recurring four-word sequences (so-called tetragrams) in its reporting."),
+    Metric("Language Complexity", "fog", "FOG Average", ".2f",
+           help="Fog-Index, an aggregate measure of readability where higher values suggest more complex and technical language - which may be appropriate in professional sustainability disclosures."),
+]}
+
+# Die beiden Sentiment-Kennzahlen – gemeinsamer View "Sentiment", kein eigener Eintrag in METRICS
+SENTIMENT_METRICS = {m.column: m for m in [
+    Metric("Sentiment", "words_pos_500", "Positive Words", ".2f"),
+    Metric("Sentiment", "words_neg_500", "Negative Words", ".2f"),
+]}
+
+# Kennzahlen und Statistiken des Aggregat-Würfels; "all" = gesamter Datensatz
+CUBE_METRICS = [m.column for m in METRICS.values()] + ["words_pos_500", "words_neg_500"]
+# Achsen des Profile-Views: Spalte → Beschriftung
+PROFILE_METRICS = {
+    **{m.column: m.view for m in METRICS.values()},
+    "words_pos_500": "Positive Sentiment",
+    "words_neg_500": "Negative Sentiment",
+}
+# Obergrenze für Dataset.memo – Ergebnis-Tabellen je (Kennzahl, Peer-Gruppe)
+MEMO_SIZE = 512
+
+QUANTILES = {"p10": 0.10, "p25": 0.25, "p75": 0.75, "p90": 0.90}
+TRIM = 0.10  # Anteil, der beim getrimmten Mittel an jedem Ende wegfällt
+CUBE_STATS = ["mean", "median", "trimmed", "count", "std", *QUANTILES]
+# Statistiken, die die Benchmark-Linien zeigen können → Beschriftung
+BENCHMARK_STATS = {"mean": "Average", "median": "Median", "trimmed": "Trimmed Mean"}
+ALL = "all"
+
+
+# Zusammenfassen der SASB_industry Variable in die SASB Sectors
+supersector_map = {
+    # Consumer Goods
+    **dict.fromkeys([
+        'Apparel Accessories & Footwear',
+        'Appliance Manufacturing',
+        'Building Products & Furnishings',
+        'E-Commerce',
+        'Household & Personal Products',
+        'Multiline and Specialty Retailers & Distributors',
+        'Toys & Sporting Goods'
+    ], 'Consumer Goods'),
+    # Extractives & Minerals Processing
+    **dict.fromkeys([
+        'Coal Operations',
+        'Construction Materials',
+        'Iron & Steel Producers',
+        'Metals & Mining',
+        'Oil & Gas – Exploration & Production',
+        'Oil & Gas – Midstream',
+        'Oil & Gas – Refining & Marketing',
+        'Oil & Gas – Services'
+    ], 'Extractives & Minerals Processing'),
+    # Financials
+    **dict.fromkeys([
+        'Asset Management & Custody Activities',
+        'Commercial Banks',
+        'Consumer Finance',
+        'Insurance',
+        'Investment Banking & Brokerage',
+        'Mortgage Finance',
+        'Security & Commodity Exchange'
+    ], 'Financials'),
+    # Food & Beverage
+    **dict.fromkeys([
+        'Agricultural Products',
+        'Alcoholic Beverages',
+        'Food Retailers & Distributors',
+        'Meat Poultry & Dairy',
+        'Non-Alcoholic Beverages',
+        'Processed Foods',
+        'Restaurants',
+        'Tobacco'
+    ], 'Food & Beverage'),
+    # Health Care
+    **dict.fromkeys([
+        'Biotechnology & Pharmaceuticals',
+        'Drug Retailers',
+        'Health Care Delivery',
+        'Health Care Distributors',
+        'Managed Care',
+        'Medical Equipment & Supplies'
+    ], 'Health Care'),
+    # Infrastructure
+    **dict.fromkeys([
+        'Electric Utilities & Power Generators',
+        'Engineering & Construction Services',
+        'Gas Utilities & Distributors',
+        'Home Builders',
+        'Real Estate',
+        'Real Estate Services',
+        'Waste Management',
+        'Water Utilities & Services'
+    ], 'Infrastructure'),
+    # Renewable Resources & Alternative Energy
+    **dict.fromkeys([
+        'Biofuels',
+        'Forestry Management',
+        'Fuel Cells & Industrial Batteries',
+        'Pulp & Paper Products',
+        'Solar Technology & Project Developers',
+        'Wind Technology & Project Developers'
+    ], 'Renewable Resources & Alternative Energy'),
+    # Resource Transformation
+    **dict.fromkeys([
+        'Aerospace & Defence',
+        'Chemicals',
+        'Containers & Packaging',
+        'Electrical & Electronic Equipment',
+        'Industrial Machinery & Goods'
+    ], 'Resource Transformation'),
+    # Services
+    **dict.fromkeys([
+        'Advertising & Marketing',
+        'Casinos & Gaming',
+        'Education',
+        'Hotels & Lodging',
+        'Leisure Facilities',
+        'Media & Entertainment',
+        'Professional & Commercial Services'
+    ], 'Services'),
+    # Technology & Communications
+    **dict.fromkeys([
+        'Electronic Manufacturing Services & Original Design Manufacturing',
+        'Hardware',
+        'Internet Media & Services',
+        'Semiconductors',
+        'Software & IT Services',
+        'Telecommunication Services'
+    ], 'Technology & Communications'),
+    # Transportation
+    **dict.fromkeys([
+        'Air Freight & Logistics',
+        'Airlines',
+        'Auto Parts',
+        'Automobiles',
+        'Car Rental & Leasing',
+        'Cruise Lines',
+        'Marine Transportation',
+        'Rail Transportation',
+        'Road Transportation'
+    ], 'Transportation'),
+}
+
+
+# ESRS-Topics: Suffix der rel_*-Spalten → Label
+topic_map = {
+    'affected':       'S3: Affected communities',
+    'biodiversity':   'E4: Biodiversity',
+    'climate':        'E1: Climate change',
+    'conduct':        'G1: Business conduct',
+    'consumers':      'S4: Consumers',
+    'governance':     'ESRS 2: Governance',
+    'ownworkforce':   'S1: Own workforce',
+    'pollution':      'E2: Pollution',
+    'waste':          'E5: Circular economy',
+    'water':          'E3: Water',
+    'workersvalchain':'S2: Value chain workers'
+}
+
+# Reihenfolge der Topics in Matrix und Legende (E1–E5, S1–S4, Governance)
+ESRS_TOPICS = [
+    'climate', 'pollution', 'water', 'biodiversity', 'waste',
+    'ownworkforce', 'workersvalchain', 'affected', 'consumers',
+    'governance', 'conduct',
+]
+
+# Merkmale für "Most similar companies": Berichtsprofil + die 11 ESRS-Topic-Anteile
+SIMILARITY_FEATURES = [
+    "words", "fog", "nums_500", "tables_500", "imgsize", "words_pos_500", "words_neg_500",
+    *[f"rel_{t}" for t in ESRS_TOPICS],
+]
+SIMILAR_PEERS = 20      # Anzahl nächster Nachbarn
+SIMILARITY_BLOCK = 65536  # Zeilen je Block bei der Top-k-Suche
+
+# Multi-Focal: höchstens so viele Focal-Firmen gleichzeitig hervorheben
+MAX_FOCALS = 5
+
+
+def fix_company_names(names: pd.Series) -> pd.Series:
+    """Capitalise names that start with a lower-case letter; the rest stays unchanged."""
+    first = names.str[:1]
+    return names.where(~first.str.islower().fillna(False).astype(bool), first.str.upper() + names.str[1:])
+
+
+def _alias_key(values: pd.Series) -> pd.Series:
+    return values.astype("str").str.strip().str.casefold()
+
+
+@dataclass(frozen=True)
+class CompanyDirectory:
+    """Company names for the selectbox plus every alias the URL may use.
+
+    ``aliases`` maps casefolded keys to the canonical name. Keys are the
+    name itself, ``isin``, ``srn_id`` and ``long_name``; on collisions the
+    name wins over the ids and the ids win over ``long_name``.
+    """
+    names: list
+    positions: dict
+    aliases: dict
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "CompanyDirectory":
+        frame = frame.dropna(subset=["company"])
+        names = sorted(frame["company"].unique(), key=str.lower)
+        aliases = {}
+        # niedrigste Priorität zuerst, spätere Einträge überschreiben
+        for column in ["long_name", "srn_id", "isin", "company"]:
+            valid = frame[column].notna()
+            keys = _alias_key(frame.loc[valid, column])
+            aliases.update(zip(keys, frame.loc[valid, "company"]))
+        return cls(names, {name: pos for pos, name in enumerate(names)}, aliases)
+
+    def resolve(self, raw: str):
+        """Canonical company name for a URL value, or ``None`` if unknown."""
+        raw = raw.strip()
+        if raw in self.positions:
+            return raw
+        return self.aliases.get(raw.casefold())
+
+
+def cap_label(terc) -> str:
+    """Map a Market_Cap_Cat decile (1-10) to its Small/Mid/Large-Cap label."""
+    if pd.isna(terc):
+        return "Unknown"
+    return ("Small-Cap" if 1 <= terc <= 3 else
+            "Mid-Cap"   if 4 <= terc <= 7 else
+            "Large-Cap" if 8 <= terc <= 10 else
+            "Unknown")
+
+
+_digests = {}
+
+
+def _content_digest(path: str):
+    """Return ``(stat, sha256)`` of a file, hashing only when mtime/size change."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        with open(path, "rb") as fh:
+            digest = hashlib.sha256(fh.read()).hexdigest()
+        _digests[key] = digest
+    return stat, digest
+
+
+def file_fingerprint(path: str) -> str:
+    """Return a cache key built from the file's mtime and content hash.
+
+    The hash is only recomputed when mtime or size change, so calling this on
+    every Streamlit rerun costs a single ``os.stat``.
+    """
+    stat, digest = _content_digest(path)
+    return f"{stat.st_mtime_ns}-{digest[:16]}"
+
+
+def artifact_path(csv_path: str) -> str:
+    """Location of the compiled artifact belonging to ``csv_path``."""
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+
+def artifact_format() -> str:
+    """Cleaning version plus a hash of the dtype and mapping tables ``clean_frame`` applies."""
+    tables = repr((sorted(CSV_DTYPES.items()), CATEGORY_COLUMNS, sorted(supersector_map.items())))
+    return f"{ARTIFACT_FORMAT_VERSION}-{hashlib.sha256(tables.encode()).hexdigest()[:16]}"
+
+
+# Registry der abgeleiteten Spalten: Name → (benötigte Spalten, vektorisierte Funktion).
+# Jede Spalte wird genau einmal pro Datenversion berechnet; Views schreiben nie in den Frame.
+DERIVED_COLUMNS = {}
+
+
+def derived(name: str, *requires: str):
+    """Register a vectorised function computing ``name`` from the ``requires`` columns."""
+    def register(func):
+        DERIVED_COLUMNS[name] = (list(requires), func)
+        return func
+    return register
+
+
+@derived("norm_pages", "words")
+def _norm_pages(df: pd.DataFrame):
+    # 500 Wörter = 1 Norm-Page
+    return df["words"] / 500
+
+
+@derived("cap_group", "Market_Cap_Cat")
+def _cap_group(df: pd.DataFrame):
+    terc = df["Market_Cap_Cat"].astype("float64").to_numpy()
+    return np.select(
+        [(terc >= 1) & (terc <= 3), (terc >= 4) & (terc <= 7), (terc >= 8) & (terc <= 10)],
+        ["Small-Cap", "Mid-Cap", "Large-Cap"],
+        default="Unknown",
+    )
+
+
+def _topic_share(t: str):
+    return lambda df: df[f"rel_{t}"]
+
+
+for _t in topic_map:
+    derived(f"{_t}_pct", f"rel_{_t}")(_topic_share(_t))
+
+
+def derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add all registered derived columns in one step."""
+    return df.assign(**{name: func(df) for name, (_, func) in DERIVED_COLUMNS.items()})
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean raw report rows; columns a delta file leaves out are skipped."""
+    if "company" in df:
+        df["company"] = fix_company_names(df["company"])
+
+    if "SASB industry" in df:
+        # alle mehrfachen spaces → 1 space
+        df["SASB industry"] = (
+            df["SASB industry"]
+              .str.replace(r"\s+", " ", regex=True)
+              .str.strip()
+        )
+        df["supersector"] = df["SASB industry"].map(supersector_map).fillna("Other")
+
+    # Echte Timestamps
+    if "publication date" in df:
+        df["publication date"] = pd.to_datetime(df["publication date"])
+
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+
+    return df
+
+
+def load_csv(path: str = DATA_FILE) -> pd.DataFrame:
+    """Parse and clean the merged report CSV (derived columns are added on load)."""
+    return clean_frame(pd.read_csv(path, dtype=CSV_DTYPES))
+
+
+def load_delta(path: str) -> pd.DataFrame:
+    """Parse and clean one delta file; every row needs an isin or srn_id."""
+    df = clean_frame(pd.read_csv(path, dtype=CSV_DTYPES))
+    isin = df["isin"] if "isin" in df else pd.Series(pd.NA, index=df.index)
+    srn = df["srn_id"] if "srn_id" in df else pd.Series(pd.NA, index=df.index)
+    missing = isin.isna() & srn.isna()
+    if missing.any():
+        raise ValueError(
+            f"{path}: rows {list(missing[missing].index)} have neither isin nor srn_id"
+        )
+    return df
+
+
+def compile_artifact(csv_path: str = DATA_FILE, out_path: str = None) -> str:
+    """Write the cleaned frame as an uncompressed Arrow IPC file.
+
+    Uncompressed so that it can be memory-mapped; the CSV's content hash
+    and the cleaning format are stored in the schema metadata to detect
+    stale artifacts.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    out_path = out_path or artifact_path(csv_path)
+    _, digest = _content_digest(csv_path)
+    table = pa.Table.from_pandas(load_csv(csv_path), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        ARTIFACT_SOURCE_KEY: digest.encode(),
+        ARTIFACT_FORMAT_KEY: artifact_format().encode(),
+    })
+    # erst in eine eigene Temp-Datei schreiben: laufende Worker mappen nie ein halbes
+    # File, und gleichzeitig kompilierende Worker kommen sich nicht in die Quere
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(out_path) + ".", suffix=".tmp", dir=os.path.dirname(out_path) or "."
+    )
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.chmod(tmp_path, 0o644)  # mkstemp legt 0600 an
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return out_path
+
+
+def read_artifact(path: str, source_digest: str):
+    """Memory-map a compiled artifact as an Arrow table; ``None`` if missing, stale or broken.
+
+    Stale means built from another CSV or with another cleaning format;
+    broken means truncated or otherwise unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    except (pa.ArrowInvalid, OSError):
+        return None
+    metadata = table.schema.metadata or {}
+    if (metadata.get(ARTIFACT_SOURCE_KEY) != source_digest.encode()
+            or metadata.get(ARTIFACT_FORMAT_KEY) != artifact_format().encode()):
+        return None
+    return table
+
+
+def open_source(path: str = DATA_FILE):
+    """Column source for :class:`Dataset`: the fresh artifact, else the parsed CSV.
+
+    Only the artifact allows loading single columns; without it the CSV is
+    parsed in full once. A stale artifact is rebuilt in place.
+    """
+    _, digest = _content_digest(path)
+    artifact = artifact_path(path)
+    table = read_artifact(artifact, digest)
+    if table is None and os.path.exists(artifact):
+        # andere CSV, geänderte Bereinigung oder kaputtes File: neu bauen statt alte Daten zu zeigen
+        try:
+            compile_artifact(path, artifact)
+        except (ImportError, OSError):
+            return load_csv(path)
+        table = read_artifact(artifact, digest)
+    return load_csv(path) if table is None else table
+
+
+def load_dataset(path: str = DATA_FILE) -> pd.DataFrame:
+    """Return the complete cleaned frame including derived columns (offline use).
+
+    Derived columns are computed here rather than stored in the artifact, so
+    changes to ``DERIVED_COLUMNS`` never need a recompile.
+    """
+    source = open_source(path)
+    if not isinstance(source, pd.DataFrame):
+        source = source.to_pandas(split_blocks=True)
+    return derive_columns(source)
+
+
+def trimmed_mean(values: pd.Series, proportion: float = TRIM) -> float:
+    """Mean without the lowest and highest ``proportion`` of the values (like scipy's ``trim_mean``)."""
+    data = np.sort(values.dropna().to_numpy(dtype="float64"))
+    cut = int(proportion * len(data))
+    return data[cut:len(data) - cut].mean() if len(data) else np.nan
+
+
+def series_stat(values: pd.Series, stat: str = "mean") -> float:
+    """One cube statistic computed directly, for ad-hoc groups outside the cube."""
+    if stat in QUANTILES:
+        return values.quantile(QUANTILES[stat])
+    if stat == "trimmed":
+        return trimmed_mean(values)
+    return values.agg(stat)
+
+
+def group_stats(values: np.ndarray, codes: np.ndarray, num_groups: int) -> dict:
+    """All ``CUBE_STATS`` of every column of ``values`` for every group, in one pass.
+
+    One lexsort orders all valid values by (column, group code, value), so
+    each (column, group) is a contiguous ascending slice. Sums, sums of
+    squared deviations and the trimmed sums are weighted ``bincount``s over
+    the slice ids; median and quantiles (linear, as in pandas) are index
+    arithmetic on the slice bounds. Returns stat → array of shape
+    (num_groups, columns); NaN where a group has too few values.
+    """
+    num_slices = num_groups * values.shape[1]
+    keys = codes[:, None] + num_groups * np.arange(values.shape[1])
+    valid = ~np.isnan(values) & (codes >= 0)[:, None]
+    flat, keys = values[valid], keys[valid]
+    order = np.lexsort((flat, keys))
+    flat, keys = flat[order], keys[order]
+    bounds = np.searchsorted(keys, np.arange(num_slices + 1))
+    starts, ends = bounds[:-1], bounds[1:]
+    count = ends - starts
+
+    def total(weights):
+        return np.bincount(keys, weights=weights, minlength=num_slices)
+
+    # Position jedes Werts in seinem Slice – für das getrimmte Mittel
+    position = np.arange(len(flat)) - np.repeat(starts, count)
+    cut = (TRIM * count).astype(np.intp)
+    kept = (position >= cut[keys]) & (position < (count - cut)[keys])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total(flat) / count
+        std = np.sqrt(total((flat - mean[keys]) ** 2) / (count - 1))
+        trimmed = total(np.where(kept, flat, 0.0)) / (count - 2 * cut)
+
+    def quantile(q):
+        position = q * np.maximum(count - 1, 0)
+        lower = np.floor(position).astype(np.intp)
+        below = np.minimum(starts + lower, len(flat) - 1)
+        above = np.minimum(np.minimum(below + 1, ends - 1), len(flat) - 1)
+        result = flat[below] + (position - lower) * (flat[above] - flat[below]) if len(flat) else mean
+        return np.where(count > 0, result, np.nan)
+
+    stats = {
+        "mean": mean,
+        "median": quantile(0.5),
+        "trimmed": trimmed,
+        "count": count,
+        "std": np.where(count > 1, std, np.nan),
+        **{name: quantile(q) for name, q in QUANTILES.items()},
+    }
+    return {name: column.reshape(-1, num_groups).T for name, column in stats.items()}
+
+
+class AggregateCube:
+    """Statistics of every metric for every peer group, computed once.
+
+    One table per grouping column (plus ``ALL`` for the whole dataset),
+    indexed by group value with ``(metric, stat)`` columns – mean, median,
+    10 % trimmed mean, count, std and the P10–P90 quantiles. Each table
+    comes from one ``group_stats`` pass instead of a groupby per statistic.
+    Lookups are plain index accesses, so switching the statistic costs
+    nothing at render time.
+    """
+
+    def __init__(self, frame: pd.DataFrame, dimensions=PEER_KEYS, metrics=CUBE_METRICS):
+        self.metrics = list(metrics)
+        self.tables = {dim: self._aggregate(frame[dim], frame) for dim in dimensions}
+        self.tables[ALL] = self._aggregate(pd.Series(ALL, index=frame.index, name=ALL), frame)
+
+    def _aggregate(self, keys: pd.Series, frame: pd.DataFrame) -> pd.DataFrame:
+        groups = keys if isinstance(keys.dtype, pd.CategoricalDtype) else keys.astype("category")
+        codes = groups.cat.codes.to_numpy()
+        categories = groups.cat.categories
+        values = frame[self.metrics].to_numpy(dtype="float64", na_value=np.nan)
+        stats = group_stats(values, codes, len(categories))
+        # wie groupby(observed=True): nur Gruppen, die mindestens eine Zeile haben
+        observed = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+        index = categories[observed]
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            index = pd.CategoricalIndex(index, dtype=keys.dtype)
+        return pd.DataFrame(
+            {(m, s): stats[s][observed, j] for j, m in enumerate(self.metrics) for s in CUBE_STATS},
+            index=index.rename(keys.name),
+        )
+
+    def updated(self, frame: pd.DataFrame, changed_groups: dict) -> "AggregateCube":
+        """Copy with only ``changed_groups`` (dimension → group values) recomputed.
+
+        The whole-dataset row is always recomputed; it is a single group.
+        """
+        cube = AggregateCube.__new__(AggregateCube)
+        cube.metrics = self.metrics
+        cube.tables = dict(self.tables)
+        for dim, groups in changed_groups.items():
+            if dim not in cube.tables or not groups:
+                continue
+            groups = list(groups)
+            rows = frame[frame[dim].isin(groups)]
+            fresh = self._aggregate(rows[dim], rows)
+            kept = cube.tables[dim].drop(index=groups, errors="ignore")
+            cube.tables[dim] = pd.concat([kept, fresh]).sort_index()
+        cube.tables[ALL] = self._aggregate(pd.Series(ALL, index=frame.index, name=ALL), frame)
+        return cube
+
+    def stat(self, dimension: str, group, metric: str, stat: str = "mean") -> float:
+        """Statistic of one group; NaN for missing or empty groups."""
+        if pd.isna(group):
+            return np.nan
+        try:
+            return self.tables[dimension].at[group, (metric, stat)]
+        except KeyError:
+            return np.nan
+
+    def overall(self, metric: str, stat: str = "mean") -> float:
+        return self.stat(ALL, ALL, metric, stat)
+
+    def by(self, dimension: str, metric, stat: str = "mean"):
+        """Per-group statistic, shaped like ``df.groupby(dimension)[metric].mean()``."""
+        table = self.tables[dimension].xs(stat, axis=1, level=1)
+        if isinstance(metric, str):
+            return table[metric].rename(metric)
+        return table[list(metric)]
+
+
+@dataclass(frozen=True)
+class Rank:
+    """Position of one company in its peer group; rank 1 = best."""
+    rank: int
+    size: int
+    percentile: float  # Anteil der Peers, die gleich gut oder schlechter liegen, in %
+
+
+def rank_values(values: pd.Series) -> np.ndarray:
+    """Float array of a metric column for ranking; dates as timestamps, missing = NaN."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        stamps = values.to_numpy().view("int64").astype("float64")
+        return np.where(values.isna().to_numpy(), np.nan, stamps)
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def rank_in(sorted_values: np.ndarray, value: float, higher_first: bool = True):
+    """Rank of ``value`` among ascending ``sorted_values`` in O(log n); None without data."""
+    size = len(sorted_values)
+    if size == 0 or np.isnan(value):
+        return None
+    if higher_first:
+        at_most = int(np.searchsorted(sorted_values, value, side="right"))
+        return Rank(size - at_most + 1, size, 100.0 * at_most / size)
+    below = int(np.searchsorted(sorted_values, value, side="left"))
+    return Rank(below + 1, size, 100.0 * (size - below) / size)
+
+
+class GroupRanking:
+    """One metric presorted inside every group of one peer dimension.
+
+    A single lexsort orders the valid values by (group code, value);
+    ``starts`` marks where each group's slice begins, so ranking a company
+    is one ``searchsorted`` on the slice of its group.
+    """
+
+    def __init__(self, values: np.ndarray, codes: np.ndarray, num_groups: int):
+        self.row_values = values
+        valid = ~np.isnan(values) & (codes >= 0)
+        values, codes = values[valid], codes[valid]
+        order = np.lexsort((values, codes))
+        self.values = values[order]
+        self.starts = np.searchsorted(codes[order], np.arange(num_groups + 1))
+
+    def group(self, code: int) -> np.ndarray:
+        """Ascending values of one group (empty for missing or unknown groups)."""
+        if not 0 <= code < len(self.starts) - 1:
+            return self.values[:0]
+        return self.values[self.starts[code]:self.starts[code + 1]]
+
+    def rank(self, code: int, row: int, higher_first: bool = True):
+        return rank_in(self.group(code), self.row_values[row], higher_first)
+
+
+class TopicMatrix:
+    """The ESRS topic shares as a dense companies × topics matrix.
+
+    Columns follow ``ESRS_TOPICS``. For every peer dimension (and ``ALL``)
+    two per-group tables are precomputed once: the mean share over all
+    companies (NaN ignored), and sums/counts over the companies that
+    report any topic at all. The peer averages of the ESRS view are those
+    sums minus the focal row, so no view melts or groups at render time.
+    """
+
+    def __init__(self, values: np.ndarray, group_codes: dict):
+        self.values = values
+        self.reporting = (np.nan_to_num(values) > 0).any(axis=1)
+        num_rows = len(values)
+        codes = {key: (row_codes, len(value_codes), value_codes)
+                 for key, (row_codes, value_codes) in group_codes.items()}
+        codes[ALL] = (np.zeros(num_rows, dtype=np.intp), 1, {ALL: 0})
+        self.codes = {key: value_codes for key, (_, _, value_codes) in codes.items()}
+        self.means, self.sums, self.counts = {}, {}, {}
+        for key, (row_codes, num_groups, _) in codes.items():
+            sums, counts = self._group_sums(row_codes, num_groups, np.ones(num_rows, dtype=bool))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.means[key] = sums / counts
+            self.sums[key], self.counts[key] = self._group_sums(row_codes, num_groups, self.reporting)
+
+    def _group_sums(self, row_codes: np.ndarray, num_groups: int, rows: np.ndarray):
+        rows = rows & (row_codes >= 0)
+        present = ~np.isnan(self.values[rows])
+        sums = np.zeros((num_groups, self.values.shape[1]))
+        counts = np.zeros((num_groups, self.values.shape[1]))
+        np.add.at(sums, row_codes[rows], np.where(present, self.values[rows], 0.0))
+        np.add.at(counts, row_codes[rows], present)
+        return sums, counts
+
+    def group_means(self, key: str) -> pd.DataFrame:
+        """Mean share per group of ``key`` (rows) and topic (columns)."""
+        return pd.DataFrame(self.means[key], index=list(self.codes[key]), columns=ESRS_TOPICS)
+
+    def peer_mean(self, key: str, group, exclude_row: int = None) -> np.ndarray:
+        """Mean shares of the reporting companies in one group, optionally without one row."""
+        code = self.codes[key].get(group)
+        if code is None:
+            return np.full(len(ESRS_TOPICS), np.nan)
+        sums, counts = self.sums[key][code].copy(), self.counts[key][code].copy()
+        if exclude_row is not None and self.reporting[exclude_row]:
+            row = self.values[exclude_row]
+            sums -= np.nan_to_num(row)
+            counts -= ~np.isnan(row)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+    def rows_mean(self, rows: np.ndarray) -> np.ndarray:
+        """Mean shares of the reporting companies among ``rows`` (free peer selections)."""
+        rows = rows[self.reporting[rows]]
+        if not len(rows):
+            return np.full(len(ESRS_TOPICS), np.nan)
+        with np.errstate(invalid="ignore"):
+            return np.nanmean(self.values[rows], axis=0)
+
+
+def publication_days(values: pd.Series) -> np.ndarray:
+    """Publication dates as day numbers (days since 1970-01-01); missing dates = -1."""
+    days = values.to_numpy().astype("datetime64[D]")
+    return np.where(np.isnat(days), -1, days.view("int64"))
+
+
+class PublicationTimeline:
+    """Publication days presorted per group of one peer dimension.
+
+    A single lexsort orders the reports by (group code, day). The cumulative
+    curve of every group – its distinct days and the number of reports up to
+    each of them – is cut out of that order once, so a group's curve is a
+    slice and "how many published up to day d" is one ``searchsorted``.
+    """
+
+    def __init__(self, days: np.ndarray, codes: np.ndarray, num_groups: int):
+        self.row_days = days
+        valid = (days >= 0) & (codes >= 0)
+        days, codes = days[valid], codes[valid]
+        order = np.lexsort((days, codes))
+        self.days, codes = days[order], codes[order]
+        self.starts = np.searchsorted(codes, np.arange(num_groups + 1))
+
+        # letzter Eintrag je (Gruppe, Tag) trägt die kumulierte Anzahl
+        last = np.ones(len(self.days), dtype=bool)
+        last[:-1] = (self.days[1:] != self.days[:-1]) | (codes[1:] != codes[:-1])
+        position = np.arange(len(self.days)) - self.starts[codes] + 1
+        self.curve_days, self.curve_counts = self.days[last], position[last]
+        self.curve_starts = np.searchsorted(codes[last], np.arange(num_groups + 1))
+
+    def _slice(self, starts: np.ndarray, code: int) -> slice:
+        if not 0 <= code < len(starts) - 1:
+            return slice(0, 0)
+        return slice(starts[code], starts[code + 1])
+
+    def curve(self, code: int):
+        """(days, cumulative reports) of one group, one point per publication day."""
+        part = self._slice(self.curve_starts, code)
+        return self.curve_days[part], self.curve_counts[part]
+
+    def published_by(self, code: int, days) -> np.ndarray:
+        """Number of reports of the group published on or before each of ``days``."""
+        return np.searchsorted(self.days[self._slice(self.starts, code)], days, side="right")
+
+    def published_before(self, code: int, day: int) -> int:
+        """Number of reports of the group published strictly before ``day``."""
+        return int(np.searchsorted(self.days[self._slice(self.starts, code)], day, side="left"))
+
+
+def group_percentiles(values: np.ndarray, codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Share of its group (in %) with a value at or below each row's value; NaN if missing.
+
+    One lexsort by (group, value); ties share the position of the last
+    equal value, matching ``Rank.percentile`` with ``higher_first=True``.
+    """
+    result = np.full(len(values), np.nan)
+    rows = np.flatnonzero(~np.isnan(values) & (codes >= 0))
+    if not len(rows):
+        return result
+    order = rows[np.lexsort((values[rows], codes[rows]))]
+    sorted_values, sorted_codes = values[order], codes[order]
+    run_ends = np.flatnonzero(np.r_[(sorted_values[1:] != sorted_values[:-1])
+                                    | (sorted_codes[1:] != sorted_codes[:-1]), True])
+    last_equal = run_ends[np.searchsorted(run_ends, np.arange(len(order)))]
+    starts = np.searchsorted(sorted_codes, np.arange(len(counts)))
+    result[order] = 100.0 * (last_equal - starts[sorted_codes] + 1) / counts[sorted_codes]
+    return result
+
+
+class ProfileMatrix:
+    """Every company standardised against its own group on all ``PROFILE_METRICS``.
+
+    ``zscores`` is (value − group mean) / group std and ``percentiles`` the
+    share of the group at or below the company, both companies × metrics.
+    Built once per grouping, so the Profile view reads one row instead of
+    running eight metric views.
+    """
+
+    def __init__(self, values: np.ndarray, codes: np.ndarray, num_groups: int):
+        stats = group_stats(values, codes, num_groups)
+        grouped = codes >= 0
+        safe = np.where(grouped, codes, 0)
+        mean, std = stats["mean"][safe], stats["std"][safe]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.zscores = np.where(grouped[:, None] & (std > 0), (values - mean) / std, np.nan)
+        self.percentiles = np.column_stack([
+            group_percentiles(values[:, j], codes, stats["count"][:, j])
+            for j in range(values.shape[1])
+        ])
+        self.group_means = mean
+
+
+class PeerProfile:
+    """Profile statistics of one peer group, for scoring companies in or outside it.
+
+    Keeps the group mean, std and sorted values of every metric, so
+    ``score`` places any company against this group exactly like
+    ``ProfileMatrix`` places a member within its own group.
+    """
+
+    def __init__(self, values: np.ndarray):
+        stats = group_stats(values, np.zeros(len(values), dtype=np.intp), 1)
+        self.mean, self.std, self.count = stats["mean"][0], stats["std"][0], stats["count"][0]
+        self.sorted = np.sort(values, axis=0)   # NaN ans Ende jeder Spalte
+
+    def score(self, values: np.ndarray) -> tuple:
+        """(z-scores, percentiles) of ``values`` (companies × metrics) against the group."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zscores = np.where(self.std > 0, (values - self.mean) / self.std, np.nan)
+            at_or_below = np.column_stack([
+                np.searchsorted(self.sorted[:count, j], values[:, j], side="right")
+                for j, count in enumerate(self.count)
+            ])
+            percentiles = np.where(np.isnan(values) | (self.count == 0), np.nan,
+                                   100.0 * at_or_below / self.count)
+        return zscores, percentiles
+
+
+class SimilarityIndex:
+    """Standardised report profiles for nearest-neighbour peer search.
+
+    Each feature is z-scored over all companies; missing values become the
+    mean (0). ``nearest`` scans the matrix in fixed-size blocks and keeps
+    the running top k with ``argpartition``, so memory stays bounded and
+    one query over 100k companies is a few matrix-vector products.
+    """
+
+    def __init__(self, features: np.ndarray, block: int = SIMILARITY_BLOCK):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nanmean(features, axis=0)
+            std = np.nanstd(features, axis=0)
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        self.matrix = np.nan_to_num((features - np.nan_to_num(mean)) / std).astype("float32")
+        self.norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self.block = block
+
+    def nearest(self, row: int, k: int = SIMILAR_PEERS) -> np.ndarray:
+        """Row positions of the ``k`` most similar companies (closest first, ``row`` excluded)."""
+        query = self.matrix[row]
+        best_rows = np.empty(0, dtype=np.intp)
+        best_dist = np.empty(0, dtype="float32")
+        for start in range(0, len(self.matrix), self.block):
+            stop = min(start + self.block, len(self.matrix))
+            # |x - q|² ohne den konstanten Term |q|²
+            dist = self.norms[start:stop] - 2.0 * (self.matrix[start:stop] @ query)
+            if start <= row < stop:
+                dist[row - start] = np.inf
+            rows = np.concatenate([best_rows, np.arange(start, stop)])
+            dist = np.concatenate([best_dist, dist])
+            if len(dist) > k:
+                keep = np.argpartition(dist, k)[:k]
+                rows, dist = rows[keep], dist[keep]
+            best_rows, best_dist = rows, dist
+        order = np.argsort(best_dist, kind="stable")
+        return best_rows[order][np.isfinite(best_dist[order])]
+
+
+@dataclass(frozen=True)
+class FocalRecord:
+    """The focal company's row; each value is read from its cached column."""
+    company: str
+    row: int
+    dataset: "Dataset" = field(repr=False)
+
+    def __getitem__(self, column):
+        return self.dataset.column(column).iat[self.row]
+
+
+class Dataset:
+    """One loaded version of the report data plus lookup structures.
+
+    Columns are materialised from ``source`` on first use and cached, so
+    startup time and memory grow with the columns the views actually use,
+    not with the width of the CSV. ``source`` is the memory-mapped Arrow
+    artifact, or the parsed CSV when no artifact is available.
+
+    Instances are cached per file version and shared by all sessions, so
+    ``frame`` hands out a new copy-on-write frame per call: writes to it
+    never reach the cached data. Lookup structures are built lazily, once
+    per version.
+    """
+
+    def __init__(self, source, version: str):
+        self.source = source
+        self.version = version
+        self._columns = {}
+        self._frames = {}
+        self._results = {}
+
+    @cached_property
+    def column_names(self) -> list:
+        if isinstance(self.source, pd.DataFrame):
+            names = list(self.source.columns)
+        else:
+            names = list(self.source.column_names)
+        return names + [c for c in DERIVED_COLUMNS if c not in names]
+
+    def column(self, name: str) -> pd.Series:
+        """One column, materialised on first use."""
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = self._materialise(name)
+        return values
+
+    def _materialise(self, name: str) -> pd.Series:
+        if name in DERIVED_COLUMNS:
+            requires, func = DERIVED_COLUMNS[name]
+            inputs = self.frame(requires)
+            return pd.Series(func(inputs), index=inputs.index, name=name)
+        if isinstance(self.source, pd.DataFrame):
+            return self.source[name]
+        # split_blocks: numerische Spalten ohne Kopie direkt aus der Map
+        return self.source.select([name]).to_pandas(split_blocks=True)[name]
+
+    def frame(self, columns=None) -> pd.DataFrame:
+        """Frame of ``columns`` (default: all), cached per column list.
+
+        Every call returns a new shallow frame over the cached one; with
+        copy-on-write (the default since pandas 3) any write (``loc``/``iloc``/``inplace=True``, column
+        assignment) copies first and leaves the shared data untouched.
+        """
+        key = tuple(dict.fromkeys(self.column_names if columns is None else columns))
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._frames[key] = pd.DataFrame(
+                {name: self.column(name) for name in key}, copy=False
+            )
+        return pd.DataFrame(frame)
+
+    def memo(self, key: tuple, compute, scope: tuple = None):
+        """Result of ``compute()`` cached under ``key`` for this data version.
+
+        Used for per-(metric, peer group) tables the views derive from the
+        frame. ``scope`` names the peer rows the result depends on – a cube
+        key ``(dimension, group)`` or ``("selection", rows)``; a later
+        version reuses scoped results whose rows its delta did not touch.
+        Unscoped results start fresh with every version.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            if len(self._results) >= MEMO_SIZE:
+                # ältester Eintrag fliegt raus (dict behält Einfügereihenfolge)
+                self._results.pop(next(iter(self._results)), None)
+            entry = self._results[key] = (scope, compute())
+        return entry[1]
+
+    def _lookup(self, key: tuple):
+        return self._results.get(key)
+
+    def scope_version(self, scope: tuple) -> str:
+        """Version in which the rows of ``scope`` (see ``memo``) last changed."""
+        return self.version
+
+    @cached_property
+    def company_index(self) -> dict:
+        """company → row position (first occurrence wins, like ``.iat[0]``)."""
+        names = self.column("company").tolist()
+        return {name: pos for pos, name in reversed(list(enumerate(names)))}
+
+    @cached_property
+    def companies(self) -> CompanyDirectory:
+        return CompanyDirectory.from_frame(self.frame(["company", "long_name", "isin", "srn_id"]))
+
+    def focal(self, company: str) -> FocalRecord:
+        """Constant-time lookup of the focal company's record."""
+        return FocalRecord(company, self.company_index[company], self)
+
+    def focal_rows(self, companies) -> np.ndarray:
+        """Row positions of several focal companies, in the given order."""
+        return np.fromiter((self.company_index[c] for c in companies), dtype=np.intp, count=len(companies))
+
+    def focal_values(self, companies, column: str) -> np.ndarray:
+        """``column`` of several focal companies in one gather over the company index."""
+        return self.column(column).take(self.focal_rows(companies)).to_numpy()
+
+    @cached_property
+    def num_rows(self) -> int:
+        return len(self.column("company"))
+
+    @cached_property
+    def key_index(self) -> dict:
+        """("isin" | "srn_id", value) → row position, used to merge delta files."""
+        index = {}
+        for key in ("srn_id", "isin"):
+            for pos, value in enumerate(self.column(key).tolist()):
+                if not pd.isna(value):
+                    index.setdefault((key, value), pos)
+        return index
+
+    def apply_delta(self, delta: pd.DataFrame, version: str) -> "Dataset":
+        """New dataset version with ``delta`` upserted; this one stays unchanged."""
+        return DeltaDataset(self, delta, version)
+
+    @cached_property
+    def peer_index(self) -> dict:
+        """(grouping key, value) → sorted row positions of that peer group."""
+        index = {}
+        keys = self.frame(PEER_KEYS)
+        for key in PEER_KEYS:
+            groups = keys.groupby(key, observed=True, sort=False).indices
+            for value, positions in groups.items():
+                index[(key, value)] = positions
+        return index
+
+    def peer_rows(self, key: str, value) -> np.ndarray:
+        """Row positions of all companies with ``frame[key] == value``.
+
+        Missing values (e.g. no market cap) form no group, so they get an
+        empty array just like the old boolean mask did.
+        """
+        if pd.isna(value):
+            return _NO_ROWS
+        return self.peer_index.get((key, value), _NO_ROWS)
+
+    def selection_rows(self, companies) -> np.ndarray:
+        """Row positions of an explicit company selection, in frame order."""
+        rows = sorted(self.company_index[c] for c in companies if c in self.company_index)
+        return np.asarray(rows, dtype=np.intp)
+
+    @cached_property
+    def group_codes(self) -> dict:
+        """key → (integer code per row, code of each value); -1 = missing."""
+        codes = {}
+        for key in PEER_KEYS:
+            values = self.column(key)
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            categories = values.cat.categories
+            codes[key] = (
+                values.cat.codes.to_numpy(),
+                {value: code for code, value in enumerate(categories)},
+            )
+        return codes
+
+    @cached_property
+    def cube(self) -> AggregateCube:
+        return AggregateCube(self.frame([*PEER_KEYS, *CUBE_METRICS]))
+
+    @cached_property
+    def topics(self) -> TopicMatrix:
+        """ESRS topic shares as a matrix with per-group means, once per version."""
+        values = self.frame([f"{t}_pct" for t in ESRS_TOPICS]).to_numpy(dtype="float64", na_value=np.nan)
+        return TopicMatrix(values, self.group_codes)
+
+    def timeline(self, dimension: str) -> PublicationTimeline:
+        """Cumulative publication curves per group of ``dimension`` (``ALL`` = one group)."""
+        def build():
+            days = publication_days(self.column("publication date"))
+            if dimension == ALL:
+                return PublicationTimeline(days, np.zeros(len(days), dtype=np.intp), 1)
+            row_codes, value_codes = self.group_codes[dimension]
+            return PublicationTimeline(days, row_codes, len(value_codes))
+        return self.memo(("timeline", dimension), build)
+
+    def group_code(self, dimension: str, group) -> int:
+        """Integer code of ``group`` in ``dimension`` (0 for ``ALL``, -1 if unknown)."""
+        return 0 if dimension == ALL else self.group_codes[dimension][1].get(group, -1)
+
+    def sort_order(self, column: str, descending: bool = False) -> np.ndarray:
+        """All row positions sorted by ``column`` (stable, missing values last), once per version."""
+        def build():
+            values = self.column(column).reset_index(drop=True)
+            ordered = values.sort_values(ascending=not descending, kind="stable", na_position="last")
+            return ordered.index.to_numpy()
+        return self.memo(("sort_order", column, descending), build)
+
+    def sorted_rows(self, rows: np.ndarray, column: str, descending: bool = False) -> np.ndarray:
+        """``rows`` in the order of ``column`` – a mask over the cached global order, no sort."""
+        order = self.sort_order(column, descending)
+        member = np.zeros(self.num_rows, dtype=bool)
+        member[rows] = True
+        return order[member[order]]
+
+    def name_matches(self, rows: np.ndarray, text: str) -> np.ndarray:
+        """Mask over ``rows``: company name contains ``text`` (case-insensitive)."""
+        names = self.memo(("names_lower",), lambda: self.column("company").str.lower().to_numpy(dtype=object))
+        return pd.Series(names[rows]).str.contains(text.lower(), regex=False).to_numpy(dtype=bool, na_value=False)
+
+    @cached_property
+    def profile_values(self) -> np.ndarray:
+        """The ``PROFILE_METRICS`` columns as one float matrix (companies × metrics)."""
+        return self.frame(list(PROFILE_METRICS)).to_numpy(dtype="float64", na_value=np.nan)
+
+    def profile(self, dimension: str) -> ProfileMatrix:
+        """Profile metrics standardised within every group of ``dimension`` (``ALL`` = one group)."""
+        def build():
+            values = self.profile_values
+            if dimension == ALL:
+                return ProfileMatrix(values, np.zeros(len(values), dtype=np.intp), 1)
+            row_codes, value_codes = self.group_codes[dimension]
+            return ProfileMatrix(values, row_codes, len(value_codes))
+        return self.memo(("profile", dimension), build)
+
+    @cached_property
+    def similarity(self) -> SimilarityIndex:
+        """Nearest-neighbour index over the report profiles, once per version."""
+        columns = [c for c in SIMILARITY_FEATURES if c in self.column_names]
+        return SimilarityIndex(self.frame(columns).to_numpy(dtype="float64", na_value=np.nan))
+
+    def similar_rows(self, company: str, k: int = SIMILAR_PEERS) -> np.ndarray:
+        """Row positions of ``company`` and its ``k`` most similar companies, in frame order."""
+        row = self.company_index[company]
+        return np.sort(np.append(self.similarity.nearest(row, k), row))
+
+    def ranking(self, column: str, dimension: str) -> GroupRanking:
+        """``column`` presorted per group of ``dimension`` (``ALL`` = one group)."""
+        def build():
+            values = rank_values(self.column(column))
+            if dimension == ALL:
+                return GroupRanking(values, np.zeros(len(values), dtype=np.intp), 1)
+            row_codes, value_codes = self.group_codes[dimension]
+            return GroupRanking(values, row_codes, len(value_codes))
+        return self.memo(("ranking", column, dimension), build)
+
+    def rank(self, column: str, dimension: str, group, row: int, higher_first: bool = True):
+        """Rank of the company in ``row`` among all companies with ``dimension == group``."""
+        return self.ranking(column, dimension).rank(self.group_code(dimension, group), row, higher_first)
+
+
+def _patch_column(base: pd.Series, targets: np.ndarray, values: pd.Series, length: int) -> pd.Series:
+    """``base`` grown to ``length`` rows with ``values`` written at ``targets``.
+
+    Later delta rows win if several target the same row.
+    """
+    values = values.reset_index(drop=True)
+    if isinstance(base.dtype, pd.CategoricalDtype):
+        categories = base.cat.categories.union(pd.Index(values.dropna().unique()))
+        dtype = pd.CategoricalDtype(categories)
+        base, values = base.astype(dtype), values.astype(dtype)
+    combined = pd.concat([base, values], ignore_index=True)
+    # neue Zeilen werden immer von einem Delta-Eintrag gefüllt
+    indexer = np.concatenate([np.arange(len(base)), np.zeros(length - len(base), dtype=np.intp)])
+    indexer[targets] = len(base) + np.arange(len(values))
+    return combined.take(indexer).reset_index(drop=True).rename(base.name)
+
+
+class DeltaDataset(Dataset):
+    """A dataset version made of the flat base dataset plus every delta so far.
+
+    Columns are the base columns patched with the rows of all deltas, so a
+    version never refers to earlier versions: the chain stays one level
+    deep and old snapshots are freed once no session uses them. When the
+    version is created, the indexes and the aggregate cube the previous
+    version had built are patched for the rows and groups the latest delta
+    touches, and its memoised peer-group results of untouched groups are
+    taken over; nothing is re-read from disk.
+    """
+
+    def __init__(self, parent: Dataset, delta: pd.DataFrame, version: str):
+        super().__init__(None, version)
+        self.base = getattr(parent, "base", parent)
+        self.num_rows = parent.num_rows
+        self.new_keys = dict(getattr(parent, "new_keys", {}))
+        delta = delta.reset_index(drop=True)
+        self.deltas = [*getattr(parent, "deltas", []), delta]
+        self.delta_targets = [*getattr(parent, "delta_targets", []), self._targets(delta)]
+        self.touched = np.unique(np.concatenate(self.delta_targets))
+        self.latest = np.unique(self.delta_targets[-1])
+
+        # Stand je Zeile und Peer-Gruppe: Index in versions, in der sie zuletzt geändert wurde
+        self.versions = [*getattr(parent, "versions", [parent.version]), version]
+        current = len(self.versions) - 1
+        self.row_versions = np.zeros(self.num_rows, dtype=np.intp)
+        self.row_versions[:parent.num_rows] = getattr(parent, "row_versions", 0)
+        self.row_versions[parent.num_rows:] = current
+        self.row_versions[self.latest] = current
+        self.changed_groups = self._changed_groups(parent)
+        self.group_versions = dict(getattr(parent, "group_versions", {}))
+        for key, groups in self.changed_groups.items():
+            self.group_versions.update(dict.fromkeys(((key, group) for group in groups), current))
+
+        # Was die Vorversion schon gebaut hat, hier nur für die neuen Zeilen nachziehen
+        for name, patch in [("company_index", self._patch_company_index), ("group_codes", self._patch_group_codes),
+                            ("peer_index", self._patch_peer_index), ("cube", self._patch_cube)]:
+            if name in parent.__dict__:
+                self.__dict__[name] = patch(getattr(parent, name), parent)
+        # Ergebnisse unberührter Peer-Gruppen übernehmen; danach ist parent nicht mehr nötig
+        for key, entry in list(parent._results.items()):
+            if entry[0] is not None and self.scope_version(entry[0]) != version:
+                self._results[key] = entry
+
+    def _targets(self, delta: pd.DataFrame) -> np.ndarray:
+        """Row of each delta row: existing company (isin, else srn_id) or a new row."""
+        targets = []
+        for isin, srn in zip(self._delta_keys(delta, "isin"), self._delta_keys(delta, "srn_id")):
+            keys = [(key, value) for key, value in (("isin", isin), ("srn_id", srn)) if not pd.isna(value)]
+            row = next((self.base.key_index[k] for k in keys if k in self.base.key_index), None)
+            if row is None:
+                row = next((self.new_keys[k] for k in keys if k in self.new_keys), None)
+            if row is None:
+                row = self.num_rows
+                self.num_rows += 1
+            for key in keys:
+                if key not in self.base.key_index:
+                    self.new_keys.setdefault(key, row)
+            targets.append(row)
+        return np.asarray(targets, dtype=np.intp)
+
+    @staticmethod
+    def _delta_keys(delta: pd.DataFrame, key: str) -> list:
+        if key in delta:
+            return delta[key].tolist()
+        return [pd.NA] * len(delta)
+
+    @cached_property
+    def column_names(self) -> list:
+        names = list(self.base.column_names)
+        for delta in self.deltas:
+            names += [c for c in delta.columns if c not in names]
+        return names
+
+    def _materialise(self, name: str) -> pd.Series:
+        if name in self.base.column_names:
+            base = self.base.column(name)
+        else:
+            # Spalte gibt es erst seit einem Delta
+            base = pd.Series(pd.NA, index=pd.RangeIndex(self.base.num_rows), dtype=object, name=name)
+
+        if name in DERIVED_COLUMNS:
+            # nur die berührten Zeilen neu berechnen
+            requires, func = DERIVED_COLUMNS[name]
+            inputs = self.frame(requires).take(self.touched)
+            values = pd.Series(func(inputs), index=inputs.index, name=name)
+            return _patch_column(base, self.touched, values, self.num_rows)
+        parts = [(targets, delta[name]) for delta, targets in zip(self.deltas, self.delta_targets) if name in delta]
+        if parts:
+            # alle Deltas in einem Schritt, spätere gewinnen
+            targets = np.concatenate([targets for targets, _ in parts])
+            values = pd.concat([values for _, values in parts], ignore_index=True)
+            return _patch_column(base, targets, values, self.num_rows)
+        return base.reindex(pd.RangeIndex(self.num_rows))
+
+    def scope_version(self, scope: tuple) -> str:
+        if scope is None:
+            return self.version
+        if scope[0] == "selection":
+            rows = np.asarray(scope[1], dtype=np.intp)
+            return self.versions[self.row_versions[rows].max() if len(rows) else 0]
+        dimension, group = scope
+        if dimension not in PEER_KEYS:
+            return self.version
+        return self.versions[self.group_versions.get((dimension, group), 0)]
+
+    def _changed_groups(self, parent: Dataset) -> dict:
+        """Grouping key → peer groups the latest delta's rows left or joined."""
+        old_rows = self.latest[self.latest < parent.num_rows]
+        changed = {}
+        for key in PEER_KEYS:
+            old = parent.column(key).take(old_rows)
+            new = self.column(key).take(self.latest)
+            changed[key] = set(old.dropna().tolist()) | set(new.dropna().tolist())
+        return changed
+
+    def _patch_company_index(self, previous: dict, parent: Dataset) -> dict:
+        old_rows = self.latest[self.latest < parent.num_rows]
+        old_names = parent.column("company").take(old_rows).reset_index(drop=True)
+        if not old_names.equals(self.column("company").take(old_rows).reset_index(drop=True)):
+            # umbenannte Firma: erstes Vorkommen neu bestimmen
+            return Dataset.company_index.func(self)
+        index = dict(previous)
+        new_rows = np.arange(parent.num_rows, self.num_rows)
+        for pos, name in zip(new_rows.tolist(), self.column("company").take(new_rows).tolist()):
+            index.setdefault(name, pos)
+        return index
+
+    def _patch_group_codes(self, previous: dict, parent: Dataset) -> dict:
+        """Previous codes with the latest delta's rows recoded; new values get the next codes."""
+        codes = {}
+        for key, (row_codes, value_codes) in previous.items():
+            row_codes = np.concatenate([row_codes, np.full(self.num_rows - len(row_codes), -1, row_codes.dtype)])
+            value_codes = dict(value_codes)
+            values = self.column(key).take(self.latest).tolist()
+            for value in dict.fromkeys(v for v in values if not pd.isna(v)):
+                value_codes.setdefault(value, len(value_codes))
+            if len(value_codes) > np.iinfo(row_codes.dtype).max:
+                row_codes = row_codes.astype(np.intp)
+            row_codes[self.latest] = [-1 if pd.isna(v) else value_codes[v] for v in values]
+            codes[key] = (row_codes, value_codes)
+        return codes
+
+    def _patch_peer_index(self, previous: dict, parent: Dataset) -> dict:
+        index = dict(previous)
+        for key, groups in self.changed_groups.items():
+            new = self.column(key).take(self.latest)
+            for value in groups:
+                hit = (new == value).to_numpy(dtype=bool, na_value=False)
+                kept = np.setdiff1d(index.get((key, value), _NO_ROWS), self.latest)
+                rows = np.union1d(kept, self.latest[hit])
+                if len(rows):
+                    index[(key, value)] = rows
+                else:
+                    index.pop((key, value), None)
+        return index
+
+    def _patch_cube(self, previous: AggregateCube, parent: Dataset) -> AggregateCube:
+        return previous.updated(self.frame([*PEER_KEYS, *CUBE_METRICS]), self.changed_groups)
+
+
+class DatasetStore:
+    """The current dataset version: base file plus all delta files in ``delta_dir``.
+
+    ``refresh()`` applies new or changed delta files (sorted by name) on top
+    of the current snapshot and swaps in the result. Snapshots are never
+    modified, so a session keeps a consistent view until its next rerun.
+    Deleting an applied delta file has no effect until the base file changes.
+    A delta file that cannot be read or merged is logged and skipped until
+    it changes; the snapshot stays at the last good version.
+    """
+
+    def __init__(self, base: Dataset, delta_dir: str):
+        self.snapshot = base
+        self.delta_dir = delta_dir
+        self.applied = {}  # Dateiname → Fingerprint
+        self.errors = {}  # Dateiname → Fehlermeldung der fehlerhaften Delta-Datei
+        self._lock = threading.Lock()
+
+    def pending(self) -> list:
+        try:
+            entries = sorted(os.scandir(self.delta_dir), key=lambda e: e.name)
+        except FileNotFoundError:
+            return []
+        pending = []
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".csv"):
+                fingerprint = file_fingerprint(entry.path)
+                if self.applied.get(entry.name) != fingerprint:
+                    pending.append((entry, fingerprint))
+        return pending
+
+    def refresh(self) -> Dataset:
+        """Merge pending delta files and return the snapshot to use for this run."""
+        if not self.pending():
+            return self.snapshot
+        with self._lock:
+            for entry, fingerprint in self.pending():
+                # als erledigt merken, auch wenn sie kaputt ist: erst die nächste Änderung zählt
+                self.applied[entry.name] = fingerprint
+                try:
+                    self.snapshot = self.snapshot.apply_delta(
+                        load_delta(entry.path), f"{self.snapshot.version}+{fingerprint}"
+                    )
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    self.errors[entry.name] = str(exc)
+                    log.warning("skipping delta file %s: %s", entry.path, exc)
+                else:
+                    self.errors.pop(entry.name, None)
+        return self.snapshot
+
+
+def delta_dir(path: str = DATA_FILE) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), DELTA_DIR)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline tools for the dashboard data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = commands.add_parser(
+        "compile", help="precompute the columnar artifact loaded by url5.py")
+    compile_cmd.add_argument("--csv", default=DATA_FILE, help="source CSV (default: %(default)s)")
+    compile_cmd.add_argument("--out", default=None, help="target file (default: <csv>.arrow)")
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        print(f"wrote {compile_artifact(args.csv, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Startup timing for the CSRD Benchmarking Dashboard.
+
+The first script run in a worker process records how long each startup phase
+took (imports, data load, index build, first render). With
+``DASHBOARD_TIMINGS=1`` – set by ``python app.py --timings`` – the report is
+printed to the server log once that run has finished.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+TIMINGS_ENV = "DASHBOARD_TIMINGS"
+
+
+class StartupTimings:
+    """Durations of the startup phases; only the first measurement counts."""
+
+    def __init__(self):
+        self.phases = {}
+        self.reported = False
+
+    def record(self, name: str, seconds: float):
+        self.phases.setdefault(name, seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> str:
+        width = max(len(name) for name in self.phases)
+        lines = ["Startup timings (first run in this process):"]
+        lines += [f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases.items()]
+        return "\n".join(lines)
+
+    def print_once(self):
+        """Print the report after the first completed run, if enabled."""
+        if self.reported or not os.environ.get(TIMINGS_ENV):
+            return
+        self.reported = True
+        print(self.report(), flush=True)
+
+
+# Ein Objekt pro Prozess – das Modul bleibt über Streamlit-Reruns hinweg geladen
+STARTUP = StartupTimings()
@@ -0,0 +1,1154 @@
+"""Chart rendering for the scalar metric views of the CSRD Benchmarking Dashboard.
+
+Every view registered in ``dashboard_data.METRICS`` is drawn by one engine,
+``render_metric``, from the metric's column, label and number format. The
+tables behind the charts (group averages, sorted peer rankings) are memoised
+per data version and (metric, peer group), so they are built once and shared
+by all sessions; finished figures go through a shared ``FigureCache`` keyed
+by the full view state. Every figure passes ``slim_figure`` on its way to the
+browser and uses the slim registered template ``PAYLOAD_TEMPLATE``.
+
+Imported after the sidebar widgets are drawn, because it pulls in plotly.
+"""
+import textwrap
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+import streamlit as st
+
+from dashboard_data import (
+    ALL, BENCHMARK_STATS, ESRS_TOPICS, PROFILE_METRICS, Dataset, FocalRecord, Metric, PeerProfile, Rank,
+    rank_in, series_stat, topic_map,
+)
+
+PEER_MODE    = "Company vs. Peer Group"
+COUNTRY_MODE = "Company Country vs Other Countries"
+SECTOR_MODE  = "Company Sector vs Other Sectors"
+
+FOCAL_COLOR = "red"
+# Multi-Focal: erste Farbe = ausgewählte Firma, dann die Vergleichsfirmen (MAX_FOCALS Einträge)
+FOCAL_COLORS = [FOCAL_COLOR, "#ff7f0e", "#2ca02c", "#9467bd", "#8c564b"]
+PEER_COLOR  = "#1f77b4"
+HIST_BINS   = 20
+
+# Große Peer-Gruppen: ab LARGE_PEER_GROUP Firmen nur Top-/Bottom-N und die
+# Nachbarn der Focal-Firma als Balken, dazu ein WebGL-Streifen aller Ränge
+LARGE_PEER_GROUP = 60
+EDGE_BARS        = 10     # Balken oben und unten
+NEIGHBOUR_BARS   = 5      # Balken je Seite um die Focal-Firma
+STRIP_POINTS     = 2000   # höchstens so viele Punkte im Rang-Streifen
+
+# Speicherbudget des geteilten Figuren-Caches (serialisiertes JSON)
+FIGURE_CACHE_BYTES = 64 * 2**20
+
+
+def smart_layout(fig, num_items, *,
+                 min_height=300,    # absolute Mindesthöhe
+                 max_height=1600,   # absolute Maxhöhe
+                 bar_height=40,     # Pixel pro Item
+                 min_font=12,        # absolute Mindestschrift
+                 max_font=16        # absolute Maxschrift
+                ):
+    """
+    Passt Höhe und Schriften an, je nachdem wie viele Balken (num_items) wir haben.
+    Bei horizontalen Bars wird die y-Achse automatisch inverted,
+    so dass der größte Wert oben steht.
+    """
+    # 1) Höhe: pro Item bar_height px plus etwas Padding
+    height = min(max_height, max(min_height, num_items * bar_height + 150))
+
+    # 2) Schriftgröße: bei wenig Items groß, bei vielen kleiner
+    #    lineare Interpolation zwischen max_font (bei 1 Item) und min_font (bei 30+ Items)
+    if num_items <= 1:
+        font_size = max_font
+    else:
+        font_size = max(min_font,
+                        max_font - (num_items-1) * (max_font-min_font) / 29
+                       )
+    font_size = round(font_size, 1)
+
+    # 3) Grund-Layout
+    fig.update_layout(
+        height=height,
+        font=dict(size=font_size),
+        margin=dict(l=150, r=20, t=40, b=40),
+        yaxis=dict(tickfont=dict(size=font_size)),
+        xaxis=dict(tickfont=dict(size=font_size))
+    )
+
+    # 4) Wenn es mindestens einen horizontalen Bar-Trace gibt, y-Achse invertieren
+    if any(getattr(trace, "orientation", None) == "h" for trace in fig.data):
+        fig.update_yaxes(autorange="reversed")
+
+    return fig
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """The peer group of one run: mode, rows and where its statistics come from."""
+    ds: Dataset
+    company: str
+    focal: FocalRecord
+    mode: str
+    peer_group: str
+    frame: pd.DataFrame = field(repr=False)
+    key: tuple   # (Dimension, Gruppe) im Aggregat-Würfel; None = freie Auswahl
+    label: str
+    statistic: str = "mean"   # Statistik der Benchmark-Linien, siehe BENCHMARK_STATS
+    others: tuple = ()        # weitere Focal-Firmen, in den Charts mit hervorgehoben
+
+    @property
+    def focal_companies(self) -> tuple:
+        """The selected company first, then the companies compared with it."""
+        return (self.company, *self.others)
+
+    def focal_values(self, column: str) -> np.ndarray:
+        """``column`` of every focal company, gathered in one ``take``."""
+        return self.ds.focal_values(self.focal_companies, column)
+
+    @property
+    def version(self) -> str:
+        """Data version of the peer rows; deltas that do not touch them keep it."""
+        return self.ds.scope_version(self.memo_key)
+
+    @property
+    def memo_key(self) -> tuple:
+        """Identifies the peer rows: the cube key, or the selected row positions."""
+        if self.key is None:
+            return ("selection", tuple(self.frame.index))
+        return self.key
+
+    @property
+    def stat_label(self) -> str:
+        return f"Peer {BENCHMARK_STATS[self.statistic]}"
+
+    def stat(self, column: str, stat: str = None) -> float:
+        """Statistic of the peer group – from the cube, or computed for a free selection.
+
+        Defaults to the statistic the user picked for the benchmark lines.
+        """
+        stat = stat or self.statistic
+        if self.key is None:
+            return series_stat(self.frame[column], stat)
+        return self.ds.cube.stat(*self.key, column, stat)
+
+
+# --------------------------------------------------------------------
+# Memoisierte Tabellen – einmal pro Datenversion und (Kennzahl, Gruppe)
+# --------------------------------------------------------------------
+def group_averages(ds: Dataset, metric: Metric, dimension: str, stat: str = "mean") -> pd.DataFrame:
+    """``stat`` of ``metric`` per group of ``dimension`` (mean by default), highest first."""
+    return ds.memo(
+        ("group_avg", metric.column, dimension, stat),
+        lambda: (
+            ds.cube.by(dimension, metric.column, stat)
+            .reset_index(name=metric.column)
+            .sort_values(metric.column, ascending=False, ignore_index=True)
+        ),
+    )
+
+
+def peer_ranking(bench: Benchmark, metric: Metric) -> pd.DataFrame:
+    """Peer companies sorted by ``metric`` (highest first) with shortened names."""
+    def compute():
+        ranking = bench.frame[["company", metric.column]].sort_values(metric.column, ascending=False)
+        return ranking.assign(company_short=ranking["company"].str.slice(0, 15))
+    return bench.ds.memo(("peer_ranking", metric.column, bench.memo_key), compute, scope=bench.memo_key)
+
+
+def histogram_bins(ds: Dataset, key: tuple, values, nbins: int = HIST_BINS, scope: tuple = None):
+    """``numpy.histogram`` counts and edges, memoised under ``key`` (and ``scope``, see ``Dataset.memo``).
+
+    ``values`` is only called on a cache miss; missing values are dropped.
+    """
+    def compute():
+        data = pd.to_numeric(pd.Series(values()), errors="coerce").dropna().to_numpy(dtype="float64")
+        if not len(data):
+            return np.zeros(0, dtype=np.int64), np.zeros(1)
+        return np.histogram(data, bins=nbins)
+    return ds.memo(("hist", *key, nbins), compute, scope)
+
+
+def binned_histogram(counts: np.ndarray, edges: np.ndarray, x_label: str, y_label: str) -> go.Figure:
+    """Histogram from precomputed bins as one bar trace – the browser only gets the bins."""
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate=f"{x_label}: %{{customdata[0]:.4g}} – %{{customdata[1]:.4g}}<br>"
+                      f"{y_label}: %{{y}}<extra></extra>",
+        marker=dict(color=PEER_COLOR, line=dict(color="white", width=1)),
+        opacity=0.8,
+    ))
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label, showlegend=False)
+    return fig
+
+
+def peer_histogram(bench: Benchmark, column: str, label: str) -> go.Figure:
+    """Distribution of ``column`` over the peer companies."""
+    counts, edges = histogram_bins(bench.ds, ("peers", column, bench.memo_key),
+                                   lambda: bench.frame[column], scope=bench.memo_key)
+    return binned_histogram(counts, edges, label, "Companies")
+
+
+def group_histogram(ds: Dataset, column: str, dimension: str, label: str, y_label: str,
+                    stat: str = "mean") -> go.Figure:
+    """Distribution of the group means (or ``stat``) of ``column`` over all groups of ``dimension``."""
+    counts, edges = histogram_bins(ds, ("groups", column, dimension, stat),
+                                   lambda: ds.cube.by(dimension, column, stat))
+    return binned_histogram(counts, edges, label, y_label)
+
+
+# --------------------------------------------------------------------
+# Rang der Focal-Firma in ihrer Peer-Gruppe
+# --------------------------------------------------------------------
+def peer_rank(bench: Benchmark, column: str, higher_first: bool = True) -> Rank:
+    """Rank k of n and percentile of the focal company within the peer group.
+
+    Cube peer groups use the presorted per-group ranking of the dataset; a
+    free selection is sorted once and memoised like the other peer tables.
+    Returns None when the company or the group has no value.
+    """
+    if bench.key is not None:
+        return bench.ds.rank(column, *bench.key, bench.focal.row, higher_first)
+    ranking = bench.ds.ranking(column, ALL)
+
+    def presort():
+        values = ranking.row_values[bench.frame.index.to_numpy()]
+        return np.sort(values[~np.isnan(values)])
+    selection = bench.ds.memo(("selection_sorted", column, bench.memo_key), presort, bench.memo_key)
+    return rank_in(selection, ranking.row_values[bench.focal.row], higher_first)
+
+
+def rank_badges(bench: Benchmark, items):
+    """One badge per (column, label[, higher_first]) with the focal company's peer rank."""
+    badges = []
+    for column, label, *order in items:
+        rank = peer_rank(bench, column, *order)
+        if rank is None:
+            badges.append(f":gray-badge[{label}: no rank available]")
+        else:
+            badges.append(
+                f":red-badge[{label}: rank {rank.rank} of {rank.size} · "
+                f"percentile {rank.percentile:.0f}]"
+            )
+    if badges:
+        st.markdown(" ".join(badges))
+
+
+# --------------------------------------------------------------------
+# Payload – jede Figur wird vor dem Versand an den Browser verkleinert
+# --------------------------------------------------------------------
+# Das Streamlit-Template reist in jeder Figur mit; registriert wird eine Kopie,
+# die nur die Trace-Typen behält, für die es überhaupt Vorgaben gibt und die
+# das Dashboard zeichnet
+PAYLOAD_TEMPLATE = "dashboard"
+TEMPLATE_TRACES  = ("scatter", "heatmap")
+
+
+def register_template(base: str = "streamlit") -> str:
+    """Register the slim shared template and make it the Plotly default."""
+    source = pio.templates[base if base in pio.templates else "plotly"]
+    pio.templates[PAYLOAD_TEMPLATE] = go.layout.Template(
+        layout=source.layout,
+        data={name: getattr(source.data, name) for name in TEMPLATE_TRACES},
+    )
+    pio.templates.default = PAYLOAD_TEMPLATE
+    return PAYLOAD_TEMPLATE
+
+
+register_template()
+
+# Zahlen-Arrays der Traces; float64 → float32 reicht für jede Anzeige-Genauigkeit
+NUMERIC_FIELDS = ("x", "y", "z", "r", "base", "width", "customdata")
+
+
+def _compact(values):
+    """Numeric arrays in the smallest dtype that keeps display precision; others unchanged."""
+    if values is None or isinstance(values, (str, dict)) or np.ndim(values) == 0:
+        return values
+    array = np.asarray(values)
+    if array.dtype.kind == "f":
+        return array.astype("float32")
+    if array.dtype.kind in "iu" and array.size and np.abs(array).max() < 2**31:
+        return array.astype("int32")
+    return values
+
+
+def _numeric(values) -> np.ndarray:
+    array = np.asarray(values) if values is not None and not isinstance(values, str) else None
+    return array if array is not None and array.dtype.kind in "fiu" else None
+
+
+def _dedup_text(trace):
+    """Drop a ``text`` array that repeats x or y; the templates read the axis value instead."""
+    text = _numeric(getattr(trace, "text", None))
+    if text is None:
+        return
+    for axis in ("x", "y"):
+        values = _numeric(getattr(trace, axis, None))
+        if values is None or values.shape != text.shape:
+            continue
+        if np.allclose(values, text, equal_nan=True):
+            trace.texttemplate = (trace.texttemplate or "%{text}").replace("%{text", "%{" + axis)
+            if isinstance(trace.hovertemplate, str):
+                trace.hovertemplate = trace.hovertemplate.replace("%{text", "%{" + axis)
+            trace.text = None
+            return
+
+
+def slim_figure(fig: go.Figure) -> go.Figure:
+    """Shrink ``fig`` in place before it is sent: compact number arrays, no duplicate
+    text arrays, no properties that only repeat Plotly defaults."""
+    for trace in fig.data:
+        _dedup_text(trace)
+        for name in NUMERIC_FIELDS:
+            if name in trace:
+                values = getattr(trace, name)
+                compact = _compact(values)
+                if compact is not values:
+                    # Plotly übernimmt keine Zuweisung, die gleich dem alten Wert ist
+                    # (int64 → int32 wäre das), daher erst leeren
+                    setattr(trace, name, None)
+                    setattr(trace, name, compact)
+        if getattr(trace, "xaxis", None) == "x":
+            trace.xaxis = None
+        if getattr(trace, "yaxis", None) == "y":
+            trace.yaxis = None
+        marker = getattr(trace, "marker", None)
+        if marker is not None and "pattern" in marker and marker.pattern.shape == "":
+            marker.pattern = None
+    return fig
+
+
+# --------------------------------------------------------------------
+# Figuren-Cache – serialisierte Charts, von allen Sessions geteilt
+# --------------------------------------------------------------------
+class FigureCache:
+    """Serialised Plotly figures shared by all sessions, LRU within a byte budget.
+
+    Keys are the full view state plus the dataset version and the chart's
+    slot in the view, so every session looking at the same state gets the
+    stored figure JSON instead of rebuilding it. Peer-group base figures
+    are keyed by the version of their peer rows instead, so they survive
+    deltas that touch other groups.
+    """
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def figure(self, key: tuple, build) -> go.Figure:
+        """The cached figure for ``key``, or ``build()`` stored under it."""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if spec is not None:
+            return pio.from_json(spec, skip_invalid=True)
+        fig = build()
+        self._store(key, pio.to_json(fig, validate=False))
+        return fig
+
+    def _store(self, key: tuple, spec: str):
+        with self._lock:
+            self.misses += 1
+            if len(spec) > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = spec
+            self.size += len(spec)
+            # am längsten nicht genutzte Figuren fliegen raus, bis das Budget passt
+            while self.size > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self.size -= len(dropped)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True)
+class Charts:
+    """Where a view draws its figures: the shared cache and the current view state.
+
+    With ``debug`` set, ``payload`` collects (slot, bytes) of every chart
+    sent in this run for the diagnostics panel.
+    """
+    cache: FigureCache
+    version: str
+    state: tuple   # (View, Mode, Peer-Gruppe, Chart-Typ, Statistik, Firma, Vergleichsfirmen, Auswahl)
+    debug: bool = False
+    payload: list = field(default_factory=list, compare=False, repr=False)
+
+    def show(self, slot: str, build, *, shared: tuple = None, overlay=None):
+        """Draw the figure of ``slot``; ``build`` runs only on a cache miss.
+
+        Without ``shared`` the figure is cached per full view state and data
+        version. With ``shared`` (the data version and peer-group key of a
+        focal-independent base figure) the base is cached once per peer
+        group and ``overlay(fig)`` adds the focal highlight to a fresh copy
+        at render time.
+        """
+        key = (self.version, *self.state, slot) if shared is None else (slot, *shared)
+        fig = build() if self.cache is None else self.cache.figure(key, lambda: slim_figure(build()))
+        if overlay is not None:
+            fig = overlay(fig)
+        self.plot(fig, slot)
+
+    def plot(self, fig: go.Figure, slot: str):
+        """Send one figure to the browser, slimmed; records its size in debug mode."""
+        fig = slim_figure(fig)
+        if self.debug:
+            self.payload.append((slot, len(pio.to_json(fig, validate=False))))
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# --------------------------------------------------------------------
+# Figuren der Kennzahl-Views – Fallback, Länder-, Sektor- oder Peer-Chart
+# --------------------------------------------------------------------
+def _group_value(table: pd.DataFrame, dimension: str, group, column: str) -> float:
+    values = table.loc[table[dimension] == group, column]
+    return values.iat[0] if len(values) else np.nan
+
+
+def focal_color_map(focals) -> dict:
+    """Focal label → highlight colour; the first occurrence of a label wins."""
+    return {label: color for label, color in reversed(list(zip(focals, FOCAL_COLORS)))}
+
+
+def highlight_bars(fig: go.Figure, labels, focals) -> go.Figure:
+    """Focal overlay for a single-trace bar chart: the bars of ``focals`` take their focal colour."""
+    colors = pd.Series(labels, dtype=object).map(focal_color_map(focals)).fillna(PEER_COLOR)
+    fig.update_traces(marker_color=colors.to_numpy(), selector=dict(type="bar"))
+    return fig
+
+
+def quantile_band(fig: go.Figure, bench: Benchmark, column: str) -> go.Figure:
+    """Shade the P25–P75 range of the peer group behind the chart."""
+    low, high = bench.stat(column, "p25"), bench.stat(column, "p75")
+    if pd.notna(low) and pd.notna(high):
+        fig.add_vrect(x0=low, x1=high, fillcolor="gray", opacity=0.12, line_width=0, layer="below",
+                      annotation_text="P25–P75", annotation_position="top left",
+                      annotation_font_color="gray")
+    return fig
+
+
+def focal_vline(fig: go.Figure, x: float, label: str, color: str = FOCAL_COLOR) -> go.Figure:
+    """Focal overlay for a histogram: a dashed line at the focal value."""
+    fig.add_vline(x=x, line_dash="dash", line_color=color, line_width=2, opacity=0.8,
+                  annotation_text=f"<b>{label}</b>", annotation_position="bottom left",
+                  annotation_font_color=color, annotation_font_size=16)
+    return fig
+
+
+def focal_vlines(fig: go.Figure, labels, values) -> go.Figure:
+    """One focal line per distinct label, coloured like the focal's bars."""
+    colors = focal_color_map(labels)
+    for label, value in dict(zip(reversed(labels), reversed(values))).items():
+        if pd.notna(value):
+            focal_vline(fig, value, label, colors[label])
+    return fig
+
+
+def comparison_figure(metric: Metric, groups: list, values: list) -> go.Figure:
+    """Vertical bars: the focal groups/companies in their focal colours next to the reference (last)."""
+    comp_df = pd.DataFrame({"Group": groups, metric.column: values})
+    fig = px.bar(
+        comp_df,
+        x="Group", y=metric.column, text=metric.column,
+        color="Group",
+        color_discrete_map={**focal_color_map(groups[:-1]), groups[-1]: PEER_COLOR},
+        labels={metric.column: metric.label, "Group": ""}
+    )
+    fig.update_layout(xaxis={"categoryorder": "array", "categoryarray": groups}, showlegend=False)
+    fig.update_traces(texttemplate=f"%{{text:{metric.fmt}}}", textposition="outside", width=0.5)
+    return fig
+
+
+def group_comparison_figure(metric: Metric, bench: Benchmark, dimension: str, other_label: str) -> go.Figure:
+    """Focal group statistics vs. the average of that statistic over all other groups of ``dimension``."""
+    table = group_averages(bench.ds, metric, dimension, bench.statistic)
+    focal_groups = list(dict.fromkeys(bench.focal_values(dimension)))
+    others = table.loc[~table[dimension].isin(focal_groups), metric.column].mean()
+    return comparison_figure(metric, [*focal_groups, other_label],
+                             [*(_group_value(table, dimension, g, metric.column) for g in focal_groups), others])
+
+
+def group_histogram_figure(metric: Metric, ds: Dataset, dimension: str,
+                           all_label: str, axis_label: str, stat: str = "mean") -> go.Figure:
+    """Base: distribution of the group statistics with the all-groups average."""
+    table = group_averages(ds, metric, dimension, stat)
+    fig = group_histogram(ds, metric.column, dimension, metric.label, axis_label, stat)
+    fig.add_vline(x=table[metric.column].mean(), line_dash="dash", line_color="black",
+                  annotation_text=f"<b>{all_label}</b>", annotation_position="top right",
+                  annotation_font_color="black", annotation_font_size=16)
+    return fig
+
+
+def focal_group_vline(fig: go.Figure, metric: Metric, bench: Benchmark, dimension: str) -> go.Figure:
+    groups = list(bench.focal_values(dimension))
+    table = group_averages(bench.ds, metric, dimension, bench.statistic)
+    return focal_vlines(fig, [f"{g} {BENCHMARK_STATS[bench.statistic]}" for g in groups],
+                        [_group_value(table, dimension, g, metric.column) for g in groups])
+
+
+def no_peers_figure(metric: Metric, bench: Benchmark) -> go.Figure:
+    """Fallback when the focal company has no peers in its group."""
+    if bench.mode == PEER_MODE and bench.peer_group == "Market Cap Peers":
+        # Durchschnitt je Größenklasse plus die ausgewählte Firma
+        cap_avg = group_averages(bench.ds, metric, "cap_group", bench.statistic).rename(columns={"cap_group": "Group"})
+        cap_avg = cap_avg[cap_avg["Group"] != "Unknown"]
+        plot_df = pd.concat(
+            [cap_avg, pd.DataFrame({"Group": [bench.company], metric.column: [bench.focal[metric.column]]})],
+            ignore_index=True,
+        )
+        plot_df["highlight"] = np.where(plot_df["Group"] == bench.company, "Your Company", "Market Cap Group")
+        fig = px.bar(
+            plot_df,
+            x=metric.column, y="Group", orientation="h", text=metric.column,
+            color="highlight",
+            category_orders={
+                "Group":     ["Small-Cap", "Mid-Cap", "Large-Cap", bench.company],
+                "highlight": ["Market Cap Group", "Your Company"]
+            },
+            color_discrete_map={"Market Cap Group": PEER_COLOR, "Your Company": FOCAL_COLOR},
+            labels={metric.column: metric.label, "Group": ""}
+        )
+        fig.update_layout(xaxis_title=metric.label, margin=dict(l=120), showlegend=False)
+    else:
+        comp_df = pd.DataFrame({"Group": [bench.stat_label], metric.column: [bench.stat(metric.column)]})
+        fig = px.bar(
+            comp_df,
+            x=metric.column, y="Group", orientation="h", text=metric.column,
+            labels={metric.column: metric.label, "Group": ""}
+        )
+    fig.update_traces(texttemplate=f"%{{text:{metric.fmt}}}", textposition="outside")
+    return fig
+
+
+def country_bars_figure(metric: Metric, ds: Dataset, stat: str = "mean") -> go.Figure:
+    """Base: country averages (or ``stat``, highest first) with the overall value."""
+    country_avg = group_averages(ds, metric, "country", stat)
+    country_avg = country_avg.assign(country_short=country_avg["country"].str.slice(0, 15))
+    y_order = country_avg["country_short"].tolist()
+    fig = px.bar(
+        country_avg,
+        x=metric.column, y="country_short", orientation="h",
+        category_orders={"country_short": y_order},
+        labels={metric.column: metric.label, "country_short": ""},
+        hover_data={metric.column: f":{metric.fmt}"}
+    )
+    fig.add_vline(x=ds.cube.overall(metric.column, stat), line_dash="dash", line_color="black",
+                  line_width=2, annotation_text=f"<b>Peer {BENCHMARK_STATS[stat]}</b>",
+                  annotation_position="bottom right")
+    fig = smart_layout(fig, len(country_avg))
+    fig.update_layout(showlegend=False)
+    fig.update_yaxes(categoryorder="array", categoryarray=y_order)
+    return fig
+
+
+def sector_bars_figure(metric: Metric, ds: Dataset, stat: str = "mean") -> go.Figure:
+    """Base: supersector averages (or ``stat``, highest first) with the all-sectors average."""
+    sector_avg = group_averages(ds, metric, "supersector", stat)
+    # Mehrzeilige Labels (Umbruch bei 20 Zeichen)
+    sector_avg = sector_avg.assign(
+        sector_short=sector_avg["supersector"].map(lambda s: "<br>".join(textwrap.wrap(str(s), width=20))),
+    )
+    fig = px.bar(
+        sector_avg,
+        x=metric.column, y="sector_short", orientation="h",
+        category_orders={"sector_short": sector_avg["sector_short"].tolist()[::-1]},
+        labels={"sector_short": "", metric.column: metric.label},
+        hover_data={metric.column: f":{metric.fmt}"}
+    )
+    fig.add_vline(x=sector_avg[metric.column].mean(), line_dash="dash", line_color="black",
+                  annotation_text="<b>All Sectors Avg</b>", annotation_position="bottom right",
+                  annotation_font_color="black", annotation_font_size=16)
+    fig = smart_layout(fig, len(sector_avg))
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def peer_histogram_figure(metric: Metric, bench: Benchmark) -> go.Figure:
+    """Base: peer distribution with the peer statistic and the P25–P75 band."""
+    fig = quantile_band(peer_histogram(bench, metric.column, metric.label), bench, metric.column)
+    fig.add_vline(x=bench.stat(metric.column), line_dash="dash", line_color="black", line_width=1,
+                  opacity=0.6, annotation_text=f"<b>{bench.stat_label}</b>", annotation_position="top right",
+                  annotation_font_color="black", annotation_font_size=16)
+    return fig
+
+
+def peer_bars_figure(metric: Metric, bench: Benchmark) -> go.Figure:
+    """Base: every peer company (highest first) with the peer statistic and the P25–P75 band."""
+    ranking = peer_ranking(bench, metric)
+    fig = px.bar(
+        ranking,
+        x=metric.column, y="company_short", orientation="h",
+        labels={metric.column: metric.label, "company_short": "Company"},
+        category_orders={"company_short": ranking["company_short"].tolist()[::-1]},
+        hover_data={metric.column: f":{metric.fmt}"}
+    )
+    quantile_band(fig, bench, metric.column)
+    fig.add_vline(x=bench.stat(metric.column), line_dash="dash", line_color="black",
+                  annotation_text=f"<b>{bench.stat_label}</b>", annotation_position="bottom right",
+                  annotation_font_color="black", annotation_font_size=16)
+    fig = smart_layout(fig, len(ranking))
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def compact_rows(size: int, focals) -> list:
+    """Ranking positions shown as bars in the compact mode, ascending, without duplicates."""
+    shown = set(range(min(EDGE_BARS, size))) | set(range(max(size - EDGE_BARS, 0), size))
+    for focal in focals:
+        shown |= set(range(max(focal - NEIGHBOUR_BARS, 0), min(focal + NEIGHBOUR_BARS + 1, size)))
+    return sorted(shown)
+
+
+def compact_peer_bars_figure(metric: Metric, bench: Benchmark) -> go.Figure:
+    """Large peer groups: a rank strip of every peer above bars for the top, bottom and focal neighbourhood.
+
+    The strip is a ``Scattergl`` trace thinned to at most ``STRIP_POINTS``
+    evenly spaced ranks, the bar panel has a fixed number of categories,
+    so payload and client layout stay bounded however large the group is.
+    """
+    ranking = peer_ranking(bench, metric).dropna(subset=[metric.column])
+    values = ranking[metric.column].to_numpy()
+    names = ranking["company"].to_numpy()
+    size = len(ranking)
+    colors = focal_color_map(bench.focal_companies)
+    focals = np.flatnonzero(np.isin(names, list(colors)))
+
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, row_heights=[0.3, 0.7], vertical_spacing=0.08,
+        subplot_titles=[f"All {size} peers by rank", f"Top {EDGE_BARS}, bottom {EDGE_BARS} and around {bench.company}"],
+    )
+    # 1) Rang-Streifen: gleichmäßig ausgedünnt, Rang 1 oben
+    strip = np.unique(np.linspace(0, size - 1, min(size, STRIP_POINTS)).round().astype(np.intp))
+    fig.add_trace(go.Scattergl(
+        x=values[strip], y=strip + 1, mode="markers", text=names[strip],
+        marker=dict(color=PEER_COLOR, size=4),
+        hovertemplate=f"%{{text}}<br>Rank %{{y}}<br>{metric.label}: %{{x:{metric.fmt}}}<extra></extra>",
+    ), row=1, col=1)
+    if len(focals):
+        fig.add_trace(go.Scattergl(
+            x=values[focals], y=focals + 1, mode="markers", text=names[focals],
+            marker=dict(color=[colors[n] for n in names[focals]], size=10),
+            hovertemplate=f"%{{text}}<br>Rank %{{y}}<br>{metric.label}: %{{x:{metric.fmt}}}<extra></extra>",
+        ), row=1, col=1)
+
+    # 2) Balken; Lücken als leere Kategorie mit den ausgelassenen Rängen
+    categories, bar_labels, bar_values, bar_colors = [], [], [], []
+    previous = -1
+    for position in compact_rows(size, focals):
+        if position > previous + 1:
+            categories.append(f"· · · ranks {previous + 2}–{position}")
+        label = f"{position + 1}. {names[position][:15]}"
+        categories.append(label)
+        bar_labels.append(label)
+        bar_values.append(values[position])
+        bar_colors.append(colors.get(names[position], PEER_COLOR))
+        previous = position
+    fig.add_trace(go.Bar(
+        x=bar_values, y=bar_labels, orientation="h", marker_color=bar_colors,
+        hovertemplate=f"%{{y}}<br>{metric.label}: %{{x:{metric.fmt}}}<extra></extra>",
+    ), row=2, col=1)
+
+    low, high = bench.stat(metric.column, "p25"), bench.stat(metric.column, "p75")
+    if pd.notna(low) and pd.notna(high):
+        fig.add_vrect(x0=low, x1=high, fillcolor="gray", opacity=0.12, line_width=0, layer="below",
+                      annotation_text="P25–P75", annotation_position="top left",
+                      annotation_font_color="gray", row=2, col=1)
+    fig.add_vline(x=bench.stat(metric.column), line_dash="dash", line_color="black", line_width=1,
+                  row=1, col=1)
+    fig.add_vline(x=bench.stat(metric.column), line_dash="dash", line_color="black",
+                  annotation_text=f"<b>{bench.stat_label}</b>", annotation_position="bottom right",
+                  annotation_font_color="black", annotation_font_size=16, row=2, col=1)
+
+    fig = smart_layout(fig, len(categories), bar_height=30)
+    fig.update_yaxes(title_text="Rank", row=1, col=1)
+    fig.update_yaxes(categoryorder="array", categoryarray=categories, row=2, col=1)
+    fig.update_xaxes(title_text=metric.label, row=2, col=1)
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def render_peer_bars(metric: Metric, bench: Benchmark, charts: Charts, slot: str = "bars"):
+    """Bar chart of the peer companies – every peer, or the compact mode for large groups.
+
+    Small groups share one base figure per peer group and get the focal bar
+    as an overlay; the compact figure depends on the focal company's rank
+    and is cached per view state.
+    """
+    peers = peer_ranking(bench, metric)["company"]
+    if len(peers) > LARGE_PEER_GROUP:
+        charts.show(slot, lambda: compact_peer_bars_figure(metric, bench))
+    else:
+        charts.show(slot, lambda: peer_bars_figure(metric, bench),
+                    shared=(bench.version, metric.column, bench.statistic, bench.memo_key),
+                    overlay=lambda fig: highlight_bars(fig, peers, bench.focal_companies))
+
+
+def render_metric(metric: Metric, bench: Benchmark, plot_type: str, charts: Charts):
+    """Draw one scalar metric view for the current peer group and chart type."""
+    st.subheader(f"{metric.heading} ({bench.label})")
+    rank_badges(bench, [(metric.column, metric.label)])
+
+    # Fallback: keine echten Peers (außer bei freier Auswahl)
+    if bench.frame["company"].nunique() <= 1 and bench.peer_group != "Choose specific peers":
+        st.warning("Unfortunately, there are no data available for your company.")
+        charts.show("no_peers", lambda: no_peers_figure(metric, bench))
+    elif bench.mode == COUNTRY_MODE and plot_type == "Histogram":
+        charts.show("histogram",
+                    lambda: group_histogram_figure(metric, bench.ds, "country", "All Countries Avg", "Countries",
+                                                   bench.statistic),
+                    shared=(bench.ds.version, metric.column, "country", bench.statistic),
+                    overlay=lambda fig: focal_group_vline(fig, metric, bench, "country"))
+    elif bench.mode == COUNTRY_MODE:
+        countries = group_averages(bench.ds, metric, "country", bench.statistic)["country"]
+        charts.show("bars", lambda: country_bars_figure(metric, bench.ds, bench.statistic),
+                    shared=(bench.ds.version, metric.column, "country", bench.statistic),
+                    overlay=lambda fig: highlight_bars(fig, countries, bench.focal_values("country")))
+        # Vergleich Focal-Land vs. Durchschnitt der übrigen Länder
+        charts.show("comparison", lambda: group_comparison_figure(
+            metric, bench, "country", "Other countries average"))
+    elif bench.mode == SECTOR_MODE and plot_type == "Histogram":
+        charts.show("histogram",
+                    lambda: group_histogram_figure(metric, bench.ds, "supersector", "All Sectors Avg", "Sectors",
+                                                   bench.statistic),
+                    shared=(bench.ds.version, metric.column, "supersector", bench.statistic),
+                    overlay=lambda fig: focal_group_vline(fig, metric, bench, "supersector"))
+    elif bench.mode == SECTOR_MODE:
+        sectors = group_averages(bench.ds, metric, "supersector", bench.statistic)["supersector"]
+        charts.show("bars", lambda: sector_bars_figure(metric, bench.ds, bench.statistic),
+                    shared=(bench.ds.version, metric.column, "supersector", bench.statistic),
+                    overlay=lambda fig: highlight_bars(fig, sectors, bench.focal_values("supersector")))
+        # Vergleich Focal-Supersector vs. Rest
+        charts.show("comparison", lambda: group_comparison_figure(
+            metric, bench, "supersector", "Other sectors avg"))
+    elif plot_type == "Histogram":
+        charts.show("histogram", lambda: peer_histogram_figure(metric, bench),
+                    shared=(bench.version, metric.column, bench.statistic, bench.memo_key),
+                    overlay=lambda fig: focal_vlines(fig, bench.focal_companies, bench.focal_values(metric.column)))
+    else:
+        render_peer_bars(metric, bench, charts)
+        # Vertikaler Vergleich der Focal-Firmen vs. Peer-Statistik
+        charts.show("comparison", lambda: comparison_figure(
+            metric, [*bench.focal_companies, bench.stat_label],
+            [*bench.focal_values(metric.column), bench.stat(metric.column)]))
+
+
+# --------------------------------------------------------------------
+# ESRS Topic Shares – gestapelte Balken aus Slices der Topic-Matrix
+# --------------------------------------------------------------------
+TOPIC_LABELS = [topic_map[t] for t in ESRS_TOPICS]
+
+# Farben für jedes Topic
+TOPIC_COLORS = {
+    'E1: Climate change':        '#005322',
+    'E2: Pollution':             '#00672B',
+    'E3: Water':                 '#008F3C',
+    'E4: Biodiversity':          '#00A746',
+    'E5: Circular economy':      '#80D3A3',
+    'S1: Own workforce':         '#D12828',
+    'S2: Value chain workers':   '#FF1F1F',
+    'S3: Affected communities':  '#FF5C5C',
+    'S4: Consumers':             '#F28585',
+    'ESRS 2: Governance':        '#F0A151',
+    'G1: Business conduct':      '#F0CB51'
+}
+
+
+def _wrap(label, width: int = 20) -> str:
+    return "<br>".join(textwrap.wrap(str(label), width=width))
+
+
+def topic_bars_figure(groups: list, shares: np.ndarray, *, detail: bool = False) -> go.Figure:
+    """One stacked bar per group from a groups × topics share matrix (top to bottom)."""
+    shares = np.asarray(shares, dtype="float64").reshape(len(groups), len(TOPIC_LABELS))
+    long = pd.DataFrame({
+        "Group":       np.repeat(np.asarray(groups, dtype=object), len(TOPIC_LABELS)),
+        "topic_label": np.tile(TOPIC_LABELS, len(groups)),
+        "pct":         shares.ravel(),
+    })
+    # Werte-Labels nur bei ≥5 %
+    text = [f"{v*100:.0f}%" if v == v and round(v * 100) >= 5 else "" for v in long["pct"]]
+    fig = px.bar(
+        long,
+        x="pct", y="Group", color="topic_label", orientation="h", text=text,
+        labels={"Group": "", "pct": ""},
+        color_discrete_map=TOPIC_COLORS,
+        category_orders={"Group": list(dict.fromkeys(groups)), "topic_label": TOPIC_LABELS},
+    )
+    if detail:
+        # alle Gruppen: Namen in die Segmente, große Höhe, keine Legende
+        fig.update_traces(textposition="inside", insidetextanchor="start",
+                          textfont=dict(size=12, color="white"), textangle=0, width=0.8)
+        fig.update_layout(barmode="stack", xaxis_tickformat=",.0%", height=1400,
+                          margin=dict(l=150, r=20, t=20, b=20), showlegend=False)
+    else:
+        fig.update_traces(marker_line_color="black", marker_line_width=0.5, opacity=1, textangle=0)
+        fig.update_layout(barmode="stack", xaxis_tickformat=",.0%",
+                          legend=dict(title="ESRS Topic", itemsizing="constant"))
+    return fig
+
+
+def _focal_first(labels: list, focal_labels: list) -> list:
+    present = set(labels)
+    focals = [label for label in dict.fromkeys(focal_labels) if label in present]
+    return focals + sorted(present - set(focals))
+
+
+def group_topic_figures(bench: Benchmark, dimension: str, all_label: str, short):
+    """Focal groups vs. mean of all groups, and every group (focal groups first)."""
+    means = bench.ds.topics.group_means(dimension)
+    labels = [short(g) for g in means.index]
+    by_label = dict(zip(labels, means.to_numpy()))
+    focal_labels = list(dict.fromkeys(short(g) for g in bench.focal_values(dimension) if pd.notna(g)))
+    missing = np.full(len(TOPIC_LABELS), np.nan)
+    with np.errstate(invalid="ignore"):
+        overall = np.nanmean(means.to_numpy(), axis=0)
+
+    order = _focal_first(labels, focal_labels)
+
+    def summary():
+        return topic_bars_figure([*focal_labels, short(all_label)],
+                                 np.vstack([*(by_label.get(g, missing) for g in focal_labels), overall]))
+
+    def detail():
+        return topic_bars_figure(order, np.vstack([by_label[g] for g in order]), detail=True)
+    return summary, detail
+
+
+def render_esrs(bench: Benchmark, charts: Charts):
+    """ESRS topic shares of the focal companies, their groups and the peers."""
+    topics = bench.ds.topics
+    row = bench.focal.row
+
+    if bench.mode == COUNTRY_MODE:
+        summary, detail = group_topic_figures(bench, "country", "All countries", lambda g: str(g)[:15])
+        charts.show("topics", summary)
+        charts.show("topics_detail", detail)
+        return
+    if bench.mode == SECTOR_MODE:
+        summary, detail = group_topic_figures(bench, "supersector", "All sectors", _wrap)
+        charts.show("topics", summary)
+        charts.show("topics_detail", detail)
+        return
+
+    if bench.peer_group == "Market Cap Peers" and bench.frame["company"].nunique() <= 1:
+        # Fallback: Größenklassen + ausgewählte Firma
+        st.warning("Unfortunately, there are no data available for your company.")
+        groups = ["Small-Cap", "Mid-Cap", "Large-Cap"]
+        shares = [topics.peer_mean("cap_group", g) for g in groups]
+
+        def fallback():
+            fig = topic_bars_figure(groups + [bench.company], np.vstack([*shares, topics.values[row]]))
+            fig.update_traces(textposition="inside", insidetextanchor="middle")
+            return fig
+        charts.show("topics", fallback)
+        return
+
+    # Peer-Modus: nur Firmen mit Topic-Daten, Peer-Durchschnitt ohne die ausgewählte Firma
+    rows = bench.frame.index.to_numpy()
+    peer_rows = rows[topics.reporting[rows]]
+    names = bench.ds.column("company").to_numpy()
+    short_names = [str(n)[:15] for n in names[peer_rows]]
+    focal_rows = bench.ds.focal_rows(bench.focal_companies)
+    focal_rows = focal_rows[topics.reporting[focal_rows]]
+    focal_names = [str(n)[:15] for n in names[focal_rows]]
+
+    if not topics.reporting[row]:
+        st.warning("Unfortunately, there are no data available for your company.")
+        average = topics.rows_mean(peer_rows)
+    elif bench.key is None:
+        average = topics.rows_mean(peer_rows[peer_rows != row])
+    else:
+        average = topics.peer_mean(*bench.key, exclude_row=row)
+    charts.show("topics", lambda: topic_bars_figure(
+        [*focal_names, "Peer group average"], np.vstack([topics.values[focal_rows], average])))
+    order = _focal_first(short_names, focal_names)
+
+    by_name = dict(zip(short_names, topics.values[peer_rows]))
+    charts.show("topics_detail", lambda: topic_bars_figure(
+        order, np.vstack([by_name[n] for n in order]) if order else np.zeros((0, len(TOPIC_LABELS))),
+        detail=True))
+
+
+# --------------------------------------------------------------------
+# Publication Timeline – kumulierte Kurven aus den vorsortierten Tagen
+# --------------------------------------------------------------------
+def _dates(days: np.ndarray) -> np.ndarray:
+    return np.asarray(days, dtype="int64").astype("datetime64[D]")
+
+
+def peer_timeline_figure(days: np.ndarray, counts: np.ndarray) -> go.Figure:
+    """Cumulative reports of the peers as one filled area, without legend."""
+    fig = go.Figure(go.Scatter(
+        x=_dates(days), y=counts, mode="lines", name="Peers",
+        fill="tozeroy", line_color=PEER_COLOR, fillcolor=PEER_COLOR,
+    ))
+    fig.update_layout(xaxis_title="Publication Date", yaxis_title="Cumulative Reports", showlegend=False)
+    return fig
+
+
+def contrast_timeline_figure(days: np.ndarray, focal_counts: np.ndarray, other_counts: np.ndarray,
+                             focal_label: str, other_label: str) -> go.Figure:
+    """Light area for the other groups, thick dark line for the focal group."""
+    fig = go.Figure([
+        go.Scatter(x=_dates(days), y=other_counts, mode="lines", name=other_label,
+                   fill="tozeroy", fillcolor="lightblue", line=dict(width=0), opacity=0.5),
+        go.Scatter(x=_dates(days), y=focal_counts, mode="lines", name=focal_label,
+                   line=dict(color="darkblue", width=3)),
+    ])
+    fig.update_layout(xaxis_title="Publication Date", yaxis_title="Cumulative Reports",
+                      legend_title_text="")
+    return fig
+
+
+def focal_date_marker(fig: go.Figure, day: int, company: str, color: str = FOCAL_COLOR) -> go.Figure:
+    """Focal overlay: dashed line at the publication date, company name on top."""
+    if day < 0:
+        return fig
+    date = str(_dates([day])[0])
+    fig.add_shape(type="line", x0=date, x1=date, y0=0, y1=1, xref="x", yref="paper",
+                  line=dict(color=color, width=2, dash="dash"))
+    fig.add_annotation(x=date, y=1.02, xref="x", yref="paper", text=company,
+                       showarrow=False, xanchor="left", font=dict(color=color))
+    return fig
+
+
+def render_timeline(bench: Benchmark, charts: Charts):
+    """Cumulative publication curves of the benchmark and the focal companies' dates."""
+    ds = bench.ds
+    row = bench.focal.row
+    focal_day = ds.timeline(ALL).row_days[row]
+    focal_days = ds.timeline(ALL).row_days[ds.focal_rows(bench.focal_companies)]
+
+    def marker(fig):
+        # ausgewählte Firma zuletzt, damit ihre Linie oben liegt
+        colors = focal_color_map(bench.focal_companies)
+        for company, day in reversed(list(zip(bench.focal_companies, focal_days))):
+            focal_date_marker(fig, day, company, colors[company])
+        return fig
+
+    if bench.mode in (COUNTRY_MODE, SECTOR_MODE):
+        dimension = "country" if bench.mode == COUNTRY_MODE else "supersector"
+        other_label = "Others" if bench.mode == COUNTRY_MODE else "Other sectors"
+        focal_group = bench.focal[dimension]
+        timeline, code = ds.timeline(dimension), ds.group_code(dimension, focal_group)
+        days, all_counts = ds.timeline(ALL).curve(0)
+        focal_counts = timeline.published_by(code, days)
+
+        charts.show("timeline", lambda: contrast_timeline_figure(
+            days, focal_counts, all_counts - focal_counts, str(focal_group), other_label),
+            shared=(ds.version, "timeline", dimension, focal_group), overlay=marker)
+        if focal_day >= 0:
+            before = timeline.published_before(code, focal_day)
+            st.caption(f"{before} of {int(focal_counts[-1]) - 1} other companies in {focal_group} "
+                       f"published before {bench.company}.")
+        return
+
+    # Peer-Modus: Kurve der Peers ohne die Focal-Firma
+    if bench.frame["company"].ne(bench.company).sum() == 0:
+        st.warning("There are no data available for your company.")
+        return
+    if bench.key is None:
+        rows = bench.frame.index.to_numpy()
+        peer_days = ds.timeline(ALL).row_days[rows[rows != row]]
+        days, per_day = np.unique(peer_days[peer_days >= 0], return_counts=True)
+        counts = np.cumsum(per_day)
+        before = int(np.searchsorted(days, focal_day, side="left"))
+        before = int(counts[before - 1]) if before else 0
+    else:
+        timeline, code = ds.timeline(bench.key[0]), ds.group_code(*bench.key)
+        days, counts = timeline.curve(code)
+        if focal_day >= 0:
+            counts = counts - (days >= focal_day)
+        before = timeline.published_before(code, focal_day)
+    total = int(counts[-1]) if len(counts) else 0
+
+    charts.show("timeline", lambda: peer_timeline_figure(days, counts), overlay=marker)
+    if focal_day >= 0:
+        st.caption(f"{before} of {total} peers published before {bench.company}.")
+
+
+# --------------------------------------------------------------------
+# Profile – alle Kennzahlen der Focal-Firma auf einen Blick
+# --------------------------------------------------------------------
+PROFILE_LABELS = list(PROFILE_METRICS.values())
+
+
+def focal_profile(bench: Benchmark) -> pd.DataFrame:
+    """Value, z-score and percentile of every focal company on every profile metric.
+
+    All focal companies are measured against the selected company's peer
+    group – in the "vs Others" modes its country or sector. For cube peer
+    groups the selected company reads its row of the memoised profile
+    matrix of that dimension; the compared companies and free selections
+    are scored against the group's ``PeerProfile``, memoised like the
+    other peer tables.
+    """
+    ds = bench.ds
+    rows = ds.focal_rows(bench.focal_companies)
+    values = ds.profile_values[rows]
+    if bench.mode in (COUNTRY_MODE, SECTOR_MODE):
+        dimension = "country" if bench.mode == COUNTRY_MODE else "supersector"
+        memo_key = (dimension, bench.focal[dimension])
+        peers = lambda: ds.peer_rows(*memo_key)
+    else:
+        dimension = None if bench.key is None else bench.key[0]
+        memo_key = bench.memo_key
+        peers = lambda: bench.frame.index.to_numpy()
+
+    zscores, percentiles, means = (np.full(values.shape, np.nan) for _ in range(3))
+    if dimension is None or len(rows) > 1:
+        reference = ds.memo(("peer_profile", memo_key), lambda: PeerProfile(ds.profile_values[peers()]), memo_key)
+        zscores, percentiles = reference.score(values)
+        means[:] = reference.mean
+    if dimension is not None:
+        matrix = ds.profile(dimension)
+        zscores[0], percentiles[0] = matrix.zscores[rows[0]], matrix.percentiles[rows[0]]
+        means[0] = matrix.group_means[rows[0]]
+    return pd.DataFrame({
+        "company": np.repeat(np.asarray(bench.focal_companies, dtype=object), len(PROFILE_LABELS)),
+        "metric": np.tile(PROFILE_LABELS, len(rows)),
+        "value": values.ravel(),
+        "peer_mean": means.ravel(),
+        "zscore": zscores.ravel(),
+        "percentile": percentiles.ravel(),
+    })
+
+
+def profile_radar_figure(profile: pd.DataFrame) -> go.Figure:
+    """Percentiles per metric on a radar, one trace per focal company; the dashed ring is the peer median."""
+    ring = PROFILE_LABELS + PROFILE_LABELS[:1]
+    fig = go.Figure(go.Scatterpolar(r=[50] * len(ring), theta=ring, mode="lines", name="Peer Median",
+                                    line=dict(color="black", dash="dash", width=1), hoverinfo="skip"))
+    colors = focal_color_map(profile["company"].unique())
+    for company, rows in profile.groupby("company", sort=False):
+        closed = pd.concat([rows, rows.iloc[:1]], ignore_index=True)
+        fig.add_trace(go.Scatterpolar(
+            r=closed["percentile"], theta=closed["metric"], mode="lines+markers", name=company,
+            fill="toself" if len(colors) == 1 else "none", line=dict(color=colors[company]), connectgaps=True,
+            customdata=closed[["value", "zscore"]],
+            hovertemplate="%{theta}<br>Percentile: %{r:.0f}<br>Value: %{customdata[0]:.3g}"
+                          "<br>z-score: %{customdata[1]:.2f}<extra></extra>"))
+    fig.update_layout(polar=dict(radialaxis=dict(range=[0, 100], ticksuffix="%")),
+                      height=550, legend=dict(orientation="h"))
+    return fig
+
+
+def profile_heatmap_figure(profile: pd.DataFrame) -> go.Figure:
+    """z-scores per metric, one heatmap row per focal company, percentiles as labels."""
+    companies = list(profile["company"].unique())
+    labels = [f"z {z:+.2f}<br>P{p:.0f}" if pd.notna(z) and pd.notna(p) else "n/a"
+              for z, p in zip(profile["zscore"], profile["percentile"])]
+    fig = go.Figure(go.Heatmap(
+        z=profile["zscore"].to_numpy().reshape(len(companies), -1), x=PROFILE_LABELS, y=companies,
+        text=np.reshape(labels, (len(companies), -1)).tolist(), texttemplate="%{text}",
+        colorscale="RdBu_r", zmid=0, zmin=-3, zmax=3,
+        colorbar=dict(title="z-score"),
+        hovertemplate="%{x}<br>z-score: %{z:.2f}<extra></extra>",
+    ))
+    fig.update_layout(height=240 + 60 * len(companies), xaxis=dict(tickangle=-30),
+                      yaxis=dict(autorange="reversed"), margin=dict(l=150, r=20, t=40, b=40))
+    return fig
+
+
+def render_profile(bench: Benchmark, plot_type: str, charts: Charts):
+    """All profile metrics of the focal companies against the peer group in one chart."""
+    st.subheader(f"Company Profile ({bench.label})")
+    profile = focal_profile(bench)
+    focal = profile[profile["company"] == bench.company]
+    if focal["percentile"].isna().all():
+        st.warning("Unfortunately, there are no data available for your company.")
+        return
+    if plot_type == "Heatmap":
+        charts.show("profile", lambda: profile_heatmap_figure(profile))
+    else:
+        charts.show("profile", lambda: profile_radar_figure(profile))
+    missing = focal.loc[focal["percentile"].isna(), "metric"].tolist()
+    if missing:
+        st.caption(f"No comparison available for: {', '.join(missing)}.")
+
+
+# --------------------------------------------------------------------
+# Peer Company List – sortiert und gefiltert über Index-Arrays, nur eine Seite
+# --------------------------------------------------------------------
+LIST_COLUMNS = {
+    "company":                   "Company",
+    "country":                   "Country",
+    "supersector":               "Sector",
+    "SASB industry":             "SASB Industry",
+    "Sustainability_Page_Count": "Pages",
+    "words":                     "Words",
+    "norm_pages":                "Norm Pages",
+    "fog":                       "FOG Average",
+    "publication date":          "Publication Date",
+}
+DEFAULT_LIST_COLUMNS = ["country", "SASB industry", "Sustainability_Page_Count", "words"]
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def peer_list_rows(bench: Benchmark, sort_by: str, descending: bool, text: str) -> np.ndarray:
+    """Row positions of the peer list in display order, filtered by company name."""
+    ds = bench.ds
+    rows = ds.memo(("peer_list", sort_by, descending, bench.memo_key),
+                   lambda: ds.sorted_rows(bench.frame.index.to_numpy(), sort_by, descending), bench.memo_key)
+    if text:
+        rows = rows[ds.name_matches(rows, text)]
+    return rows
+
+
+def render_peer_list(bench: Benchmark):
+    """Paginated peer table: sorting, filtering and column choice run on the server,
+    only the visible page is gathered and sent."""
+    available = [c for c in LIST_COLUMNS if c in bench.ds.column_names]
+    filter_col, sort_col, order_col = st.columns([3, 3, 1])
+    text = filter_col.text_input("Filter by company name", key="peer_list_filter").strip()
+    sort_by = sort_col.selectbox("Sort by", available, index=available.index("Sustainability_Page_Count"),
+                                 format_func=LIST_COLUMNS.get, key="peer_list_sort")
+    descending = order_col.toggle("Descending", key="peer_list_descending")
+    columns = st.multiselect("Columns", [c for c in available if c != "company"],
+                             default=DEFAULT_LIST_COLUMNS, format_func=LIST_COLUMNS.get, key="peer_list_columns")
+
+    rows = peer_list_rows(bench, sort_by, descending, text)
+    # Position der Focal-Firmen in der sortierten Liste
+    positions = np.flatnonzero(np.isin(rows, bench.ds.focal_rows(bench.focal_companies)))
+    if len(positions):
+        names = bench.ds.column("company").take(rows[positions])
+        st.caption(" · ".join(f"{name}: #{pos + 1}" for name, pos in zip(names, positions.tolist())))
+    size_col, page_col, _ = st.columns([1, 1, 3])
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key="peer_list_page_size")
+    pages = max(1, -(-len(rows) // page_size))
+    # Seitenzahl zurücksetzen, wenn Filter oder Gruppe die Liste verkürzt haben
+    if st.session_state.get("peer_list_page", 1) > pages:
+        st.session_state["peer_list_page"] = 1
+    page = page_col.number_input("Page", min_value=1, max_value=pages, step=1, key="peer_list_page")
+
+    start = (page - 1) * page_size
+    visible = rows[start:start + page_size]
+    table = bench.ds.frame(["company", *columns]).take(visible).rename(columns=LIST_COLUMNS)
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    if len(rows):
+        st.caption(f"Companies {start + 1}–{start + len(visible)} of {len(rows)} · page {page} of {pages}")
+    else:
+        st.caption("No company matches the filter.")
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Die Module liegen flach im Repo-Root (kein Paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def frame():
+    """Random metrics a, b, c with gaps; "group" has a one-member group and missing values."""
+    rng = np.random.default_rng(7)
+    n = 400
+    df = pd.DataFrame(rng.normal(size=(n, 3)) * [1.0, 10.0, 1000.0], columns=["a", "b", "c"])
+    df["b"] = df["b"].round()  # Bindungen für Ränge und Perzentile
+    df = df.mask(rng.random(df.shape) < 0.15)
+    group = rng.choice(["x", "y", "z"], size=n).astype(object)
+    group[0] = "solo"
+    group[rng.random(n) < 0.05] = None
+    df["group"] = pd.Categorical(group, categories=["x", "y", "z", "solo"])
+    return df
@@ -0,0 +1,44 @@
+"""The compiled Arrow artifact: written atomically, rebuilt when stale or broken."""
+import hashlib
+import os
+import shutil
+
+import pytest
+
+from dashboard_data import DATA_FILE, artifact_path, compile_artifact, open_source, read_artifact
+
+pa = pytest.importorskip("pyarrow")
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DATA_FILE)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / DATA_FILE
+    shutil.copy(DATA_PATH, path)
+    return str(path)
+
+
+def _digest(csv_path):
+    with open(csv_path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def test_compile_leaves_no_temp_files(csv_path, tmp_path):
+    out = compile_artifact(csv_path)
+    assert out == artifact_path(csv_path)
+    assert sorted(os.listdir(tmp_path)) == sorted([DATA_FILE, os.path.basename(out)])
+    assert isinstance(open_source(csv_path), pa.Table)
+
+
+def test_truncated_artifact_is_rebuilt(csv_path):
+    out = compile_artifact(csv_path)
+    assert read_artifact(out, _digest(csv_path)) is not None
+    size = os.path.getsize(out)
+    with open(out, "r+b") as f:
+        f.truncate(size // 2)
+
+    assert read_artifact(out, _digest(csv_path)) is None
+    table = open_source(csv_path)
+    assert isinstance(table, pa.Table)
+    assert os.path.getsize(out) == size
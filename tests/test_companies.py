@@ -0,0 +1,41 @@
+"""CompanyDirectory: URL values resolve to the canonical company name."""
+import pandas as pd
+
+from dashboard_data import CompanyDirectory
+
+
+def _directory():
+    return CompanyDirectory.from_frame(pd.DataFrame({
+        "company":   ["beta AG", "Alpha SE", "Gamma", None, "Delta"],
+        "long_name": ["Beta Aktiengesellschaft", "Alpha Societas Europaea", "alpha se", "Orphan Ltd", "srn-1"],
+        "isin":      ["DE0001", "FR0002", None, "GB0004", None],
+        "srn_id":    ["SRN-1", None, "beta ag", "SRN-4", None],
+    }))
+
+
+def test_names_sorted_case_insensitively():
+    directory = _directory()
+    assert directory.names == ["Alpha SE", "beta AG", "Delta", "Gamma"]
+    assert directory.positions == {"Alpha SE": 0, "beta AG": 1, "Delta": 2, "Gamma": 3}
+
+
+def test_resolve_aliases_case_and_whitespace_insensitive():
+    directory = _directory()
+    assert directory.resolve("Gamma") == "Gamma"
+    assert directory.resolve("  BETA ag ") == "beta AG"
+    assert directory.resolve("de0001") == "beta AG"
+    assert directory.resolve("SRN-1") == "beta AG"
+    assert directory.resolve("beta aktiengesellschaft") == "beta AG"
+    assert directory.resolve("Unknown AG") is None
+    # Zeilen ohne Firmennamen liefern keine Aliase
+    assert directory.resolve("GB0004") is None
+
+
+def test_resolve_prefers_name_over_ids_over_long_name():
+    directory = _directory()
+    # "alpha se" ist long_name von Gamma, aber Name von Alpha SE
+    assert directory.resolve("alpha se") == "Alpha SE"
+    # "beta ag" ist srn_id von Gamma, aber Name von beta AG
+    assert directory.resolve("beta ag") == "beta AG"
+    # "srn-1" ist long_name von Delta, aber srn_id von beta AG
+    assert directory.resolve("srn-1") == "beta AG"
@@ -0,0 +1,40 @@
+"""AggregateCube lookups against pandas groupby, and its incremental update."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_data import ALL, CUBE_STATS, QUANTILES, AggregateCube, trimmed_mean
+
+METRICS = ["a", "b", "c"]
+
+
+def _pandas_stat(grouped, stat):
+    if stat in QUANTILES:
+        return grouped.quantile(QUANTILES[stat])
+    if stat == "trimmed":
+        return grouped.agg(trimmed_mean)
+    return grouped.agg(stat)
+
+
+@pytest.mark.parametrize("stat", CUBE_STATS)
+def test_aggregate_cube_matches_groupby(frame, stat):
+    cube = AggregateCube(frame, dimensions=["group"], metrics=METRICS)
+    expected = _pandas_stat(frame.groupby("group", observed=True)[METRICS], stat)
+    np.testing.assert_allclose(cube.by("group", METRICS, stat).to_numpy(dtype="float64"),
+                               expected.to_numpy(dtype="float64"), rtol=1e-10)
+    overall = _pandas_stat(frame.assign(all=ALL).groupby("all")[METRICS], stat)
+    np.testing.assert_allclose([cube.overall(m, stat) for m in METRICS],
+                               overall.to_numpy(dtype="float64")[0], rtol=1e-10)
+
+
+def test_aggregate_cube_update_matches_rebuild(frame):
+    cube = AggregateCube(frame, dimensions=["group"], metrics=METRICS)
+    changed = frame.copy()
+    changed.loc[[1, 2, 3], "a"] = [50.0, -50.0, np.nan]
+    changed.loc[3, "group"] = "z"
+    groups = set(frame.loc[[1, 2, 3], "group"].dropna()) | set(changed.loc[[1, 2, 3], "group"].dropna())
+    updated = cube.updated(changed, {"group": groups})
+    rebuilt = AggregateCube(changed, dimensions=["group"], metrics=METRICS)
+    for stat in CUBE_STATS:
+        pd.testing.assert_frame_equal(updated.by("group", METRICS, stat), rebuilt.by("group", METRICS, stat),
+                                      check_categorical=False)
@@ -0,0 +1,159 @@
+"""Delta merges patch the parent's columns, indexes and cube; the result must
+equal a dataset built from scratch on the merged rows."""
+import gc
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_data import (
+    ALL, CUBE_METRICS, CUBE_STATS, DATA_FILE, PEER_KEYS, Dataset, DatasetStore, DeltaDataset, load_csv, load_delta,
+)
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DATA_FILE)
+UPDATED = 3
+COLUMNS = ["company", "isin", "country", "SASB industry", "supersector", "words", "norm_pages", "cap_group"]
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return load_csv(DATA_PATH)
+
+
+@pytest.fixture
+def base(raw):
+    base = Dataset(raw.copy(), "v1")
+    # Indizes der Vorversion bauen, damit die inkrementellen Pfade laufen
+    _ = base.company_index, base.peer_index, base.group_codes, base.cube
+    return base
+
+
+@pytest.fixture
+def delta_path(raw, tmp_path):
+    """Delta moving row 3 to another country and adding a new company."""
+    moved_to = next(c for c in raw["country"].cat.categories if c != raw.at[UPDATED, "country"])
+    delta = pd.DataFrame({
+        "company": [raw.at[UPDATED, "company"], "Zeta Neu AG"],
+        "isin":    [raw.at[UPDATED, "isin"], "XX0000000001"],
+        "country": [moved_to, "Atlantis"],
+        "SASB industry": [raw.at[UPDATED, "SASB industry"], raw.at[0, "SASB industry"]],
+        "words":   [123456, 4321],
+        "Market_Cap_Cat": [raw.at[UPDATED, "Market_Cap_Cat"], 9],
+    })
+    path = tmp_path / "0001_delta.csv"
+    delta.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def merged(raw, base, delta_path):
+    """(delta dataset, dataset rebuilt from the merged rows)."""
+    delta = load_delta(delta_path)
+    ds = base.apply_delta(delta, "v2")
+
+    expected = raw.copy()
+    expected["country"] = expected["country"].cat.add_categories(["Atlantis"])
+    expected.loc[UPDATED, ["country", "words"]] = [delta.at[0, "country"], 123456]
+    new_row = delta.iloc[[1]].astype({"country": expected["country"].dtype})
+    expected = pd.concat([expected, new_row], ignore_index=True)
+    return ds, Dataset(expected, "ref")
+
+
+def _plain(values: pd.Series) -> list:
+    return [None if pd.isna(v) else v for v in values.astype(object)]
+
+
+def test_columns_match_rebuild(merged):
+    ds, ref = merged
+    assert ds.num_rows == ref.num_rows
+    for column in COLUMNS:
+        assert _plain(ds.column(column)) == _plain(ref.column(column)), column
+
+
+def test_indexes_match_rebuild(merged):
+    ds, ref = merged
+    assert ds.company_index == ref.company_index
+    assert ds.peer_index.keys() == ref.peer_index.keys()
+    for key, rows in ref.peer_index.items():
+        np.testing.assert_array_equal(ds.peer_index[key], rows)
+    for key in PEER_KEYS:
+        (codes, values), (ref_codes, ref_values) = ds.group_codes[key], ref.group_codes[key]
+        names = {code: value for value, code in values.items()}
+        ref_names = {code: value for value, code in ref_values.items()}
+        assert [names.get(c) for c in codes] == [ref_names.get(c) for c in ref_codes], key
+
+
+@pytest.mark.parametrize("dimension", [*PEER_KEYS, ALL])
+def test_cube_matches_rebuild(merged, dimension):
+    ds, ref = merged
+    for stat in CUBE_STATS:
+        got = ds.cube.by(dimension, CUBE_METRICS, stat)
+        want = ref.cube.by(dimension, CUBE_METRICS, stat)
+        got.index, want.index = got.index.astype(object), want.index.astype(object)
+        pd.testing.assert_frame_equal(got.sort_index(), want.sort_index(), check_dtype=False)
+
+
+def test_rank_matches_rebuild(merged):
+    ds, ref = merged
+    group = ds.column("country").iat[UPDATED]
+    assert ds.rank("words", "country", group, UPDATED) == ref.rank("words", "country", group, UPDATED)
+
+
+def test_memo_keeps_untouched_peer_groups(raw, base, delta_path):
+    delta = load_delta(delta_path)
+    touched = raw.at[UPDATED, "country"]
+    untouched = next(c for c in raw["country"].cat.categories if c not in (touched, delta.at[0, "country"]))
+    base.memo(("table", touched), lambda: "old", scope=("country", touched))
+    base.memo(("table", untouched), lambda: "old", scope=("country", untouched))
+    base.memo(("table", ALL), lambda: "old")
+    ds = base.apply_delta(delta, "v2")
+
+    assert ds.memo(("table", touched), lambda: "new") == "new"
+    assert ds.memo(("table", untouched), lambda: "new") == "old"
+    assert ds.memo(("table", ALL), lambda: "new") == "new"
+    assert ds.scope_version(("country", untouched)) == "v1"
+    assert ds.scope_version(("country", touched)) == "v2"
+    assert ds.scope_version(("selection", (0, 1, 2))) == "v1"
+    assert ds.scope_version(("selection", (0, UPDATED))) == "v2"
+
+
+def test_many_deltas_keep_the_chain_flat(raw, base, tmp_path):
+    ds, words = base, raw["words"].astype("float64").copy()
+    for step in range(40):
+        row = step % 5
+        path = tmp_path / f"{step:04d}_delta.csv"
+        pd.DataFrame({"isin": [raw.at[row, "isin"]], "words": [1000 + step]}).to_csv(path, index=False)
+        ds = ds.apply_delta(load_delta(str(path)), f"v{step + 2}")
+        words[row] = 1000 + step
+        if step == 0:
+            first = weakref.ref(ds)
+
+    # jede Version hängt nur an der Basis, alte Stände werden frei
+    assert ds.base is base
+    assert not any(isinstance(v, DeltaDataset) for v in vars(ds).values())
+    gc.collect()
+    assert first() is None
+    assert _plain(ds.column("words").astype("float64")) == _plain(words)
+    assert ds.scope_version(("selection", (4,))) == "v41"
+    assert ds.scope_version(("selection", (5,))) == "v1"
+
+
+def test_store_skips_broken_delta_files(raw, base, tmp_path):
+    store = DatasetStore(base, str(tmp_path))
+    pd.DataFrame({"isin": [raw.at[0, "isin"]], "words": [777]}).to_csv(tmp_path / "0001_ok.csv", index=False)
+    pd.DataFrame({"company": ["ohne Schlüssel"], "words": [1]}).to_csv(tmp_path / "0002_bad.csv", index=False)
+    good = store.refresh()
+
+    # die gute Datei ist eingespielt, die kaputte protokolliert und übersprungen
+    assert good.column("words").iat[0] == 777
+    assert list(store.errors) == ["0002_bad.csv"]
+    assert store.pending() == []
+    assert store.refresh() is good
+
+    # geänderte Datei wird erneut versucht
+    pd.DataFrame({"isin": [raw.at[1, "isin"]], "words": [888]}).to_csv(tmp_path / "0002_bad.csv", index=False)
+    fixed = store.refresh()
+    assert fixed.column("words").iat[1] == 888
+    assert store.errors == {}
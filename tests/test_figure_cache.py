@@ -0,0 +1,40 @@
+"""FigureCache: least recently used figures leave once the byte budget is exceeded."""
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dashboard_views import FigureCache
+
+
+def _figure(name: str) -> go.Figure:
+    return go.Figure(go.Bar(x=[1, 2, 3], y=[4, 5, 6], name=name))
+
+
+def _size(name: str) -> int:
+    return len(pio.to_json(_figure(name), validate=False))
+
+
+def test_least_recently_used_figure_is_evicted():
+    cache = FigureCache(max_bytes=int(2.5 * _size("a")))
+    built = []
+
+    def get(key):
+        return cache.figure((key,), lambda: built.append(key) or _figure(key))
+
+    get("a"), get("b")
+    assert get("a").data[0].name == "a"  # Treffer, a ist jetzt zuletzt genutzt
+    get("c")  # Budget reicht für zwei: b fliegt raus
+
+    assert built == ["a", "b", "c"]
+    get("a"), get("b")
+    assert built == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+
+
+def test_figure_larger_than_budget_is_not_stored():
+    cache = FigureCache(max_bytes=_size("a") - 1)
+    fig = cache.figure(("a",), lambda: _figure("a"))
+    assert fig.data[0].name == "a"
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 0, "misses": 1}
@@ -0,0 +1,41 @@
+"""Per-group statistics (quantiles, trimmed mean, …) against pandas groupby."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_data import CUBE_STATS, QUANTILES, group_stats, trimmed_mean
+
+METRICS = ["a", "b", "c"]
+GROUPS = ["x", "y", "z", "solo"]
+
+
+def _stats(frame):
+    codes = frame["group"].cat.codes.to_numpy()
+    return group_stats(frame[METRICS].to_numpy(dtype="float64", na_value=np.nan), codes, len(GROUPS))
+
+
+def _pandas_stat(grouped, stat):
+    if stat in QUANTILES:
+        return grouped.quantile(QUANTILES[stat])
+    if stat == "trimmed":
+        return grouped.agg(trimmed_mean)
+    return grouped.agg(stat)
+
+
+@pytest.mark.parametrize("stat", CUBE_STATS)
+def test_group_stats_match_pandas(frame, stat):
+    expected = _pandas_stat(frame.groupby("group", observed=False)[METRICS], stat).reindex(GROUPS)
+    np.testing.assert_allclose(_stats(frame)[stat], expected.to_numpy(dtype="float64"), rtol=1e-10)
+
+
+def test_trimmed_mean_drops_both_tails():
+    values = pd.Series([100.0, *range(1, 9), -100.0, np.nan])
+    # 10 gültige Werte: je einer fällt an jedem Ende weg
+    assert trimmed_mean(values) == pytest.approx(np.mean(range(1, 9)))
+    assert np.isnan(trimmed_mean(pd.Series([np.nan])))
+
+
+def test_trimmed_mean_matches_scipy(frame):
+    stats = pytest.importorskip("scipy.stats")
+    values = frame["a"].dropna()
+    assert trimmed_mean(values) == pytest.approx(stats.trim_mean(values, 0.10))
@@ -0,0 +1,37 @@
+"""Peer list ordering: sorted_rows keeps the global order, missing values always last."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_data import Dataset
+
+
+@pytest.fixture
+def ds():
+    return Dataset(pd.DataFrame({
+        "company": ["Delta", "alpha", None, "Beta", "gamma", "Epsilon"],
+        "pages":   pd.array([30, pd.NA, 10, 30, pd.NA, 20], dtype="Int64"),
+        "auditor": pd.Categorical(["KPMG", None, "EY", "EY", "PwC", None]),
+    }), "v1")
+
+
+@pytest.mark.parametrize("column", ["company", "pages", "auditor"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_rows_put_missing_values_last(ds, column, descending):
+    rows = np.array([0, 1, 2, 4, 5])
+    expected = (ds.column(column).take(rows)
+                .sort_values(ascending=not descending, kind="stable", na_position="last").index)
+    got = ds.sorted_rows(rows, column, descending)
+    np.testing.assert_array_equal(got, expected)
+    values = ds.column(column).take(got)
+    # fehlende Werte stehen auch absteigend am Ende
+    assert not values.isna().iloc[:values.notna().sum()].any()
+
+
+def test_sorted_rows_keep_ties_in_row_order(ds):
+    np.testing.assert_array_equal(ds.sorted_rows(np.arange(6), "pages", descending=True), [0, 3, 5, 2, 1, 4])
+
+
+def test_name_matches_ignore_case_and_missing_names(ds):
+    rows = np.arange(6)
+    np.testing.assert_array_equal(ds.name_matches(rows, "TA"), [True, False, False, True, False, False])
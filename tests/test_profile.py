@@ -0,0 +1,37 @@
+"""Profile z-scores and percentiles against pandas groupby."""
+import numpy as np
+
+from dashboard_data import PeerProfile, ProfileMatrix
+
+METRICS = ["a", "b", "c"]
+GROUPS = ["x", "y", "z", "solo"]
+
+
+def test_profile_matrix_matches_brute_force(frame):
+    codes = frame["group"].cat.codes.to_numpy()
+    values = frame[METRICS].to_numpy(dtype="float64", na_value=np.nan)
+    matrix = ProfileMatrix(values, codes, len(GROUPS))
+    grouped = frame.groupby("group", observed=False)[METRICS]
+    zscores = (frame[METRICS] - grouped.transform("mean")) / grouped.transform("std")
+    percentiles = grouped.rank(method="max", pct=True) * 100
+    np.testing.assert_allclose(matrix.zscores, zscores.to_numpy(dtype="float64"), rtol=1e-10)
+    np.testing.assert_allclose(matrix.percentiles, percentiles.to_numpy(dtype="float64"), rtol=1e-10)
+
+
+def test_peer_profile_scores_like_profile_matrix(frame):
+    codes = frame["group"].cat.codes.to_numpy()
+    values = frame[METRICS].to_numpy(dtype="float64", na_value=np.nan)
+    matrix = ProfileMatrix(values, codes, len(GROUPS))
+    members = np.flatnonzero(codes == GROUPS.index("x"))
+    reference = PeerProfile(values[members])
+    zscores, percentiles = reference.score(values[members])
+    np.testing.assert_allclose(zscores, matrix.zscores[members], rtol=1e-10)
+    np.testing.assert_allclose(percentiles, matrix.percentiles[members], rtol=1e-10)
+
+    # Firmen außerhalb der Gruppe: Anteil der Gruppe mit Wert ≤ ihrem Wert
+    outside = values[codes != GROUPS.index("x")]
+    _, percentiles = reference.score(outside)
+    for j in range(len(METRICS)):
+        group = values[members, j][~np.isnan(values[members, j])]
+        expected = [np.nan if np.isnan(v) else 100.0 * (group <= v).sum() / len(group) for v in outside[:, j]]
+        np.testing.assert_allclose(percentiles[:, j], expected)
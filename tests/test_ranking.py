@@ -0,0 +1,22 @@
+"""GroupRanking rank and percentile against a brute-force count per company."""
+import numpy as np
+import pytest
+
+from dashboard_data import GroupRanking
+
+
+@pytest.mark.parametrize("higher_first", [True, False])
+def test_group_ranking_matches_brute_force(frame, higher_first):
+    codes = frame["group"].cat.codes.to_numpy()
+    values = frame["b"].to_numpy(dtype="float64", na_value=np.nan)
+    ranking = GroupRanking(values, codes, len(frame["group"].cat.categories))
+    for row in range(len(frame)):
+        rank = ranking.rank(codes[row], row, higher_first)
+        if codes[row] < 0 or np.isnan(values[row]):
+            assert rank is None
+            continue
+        peers = values[(codes == codes[row]) & ~np.isnan(values)]
+        better = (peers > values[row]) if higher_first else (peers < values[row])
+        not_better = (peers <= values[row]) if higher_first else (peers >= values[row])
+        assert (rank.rank, rank.size) == (better.sum() + 1, len(peers))
+        assert rank.percentile == pytest.approx(100.0 * not_better.sum() / len(peers))
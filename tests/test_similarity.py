@@ -0,0 +1,20 @@
+"""SimilarityIndex nearest neighbours against a brute-force distance sort."""
+import numpy as np
+import pytest
+
+from dashboard_data import SimilarityIndex
+
+
+@pytest.mark.parametrize("block", [7, 64, 10_000])
+def test_similarity_nearest_matches_brute_force(block):
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(300, 5))
+    features[rng.random(features.shape) < 0.1] = np.nan
+    index = SimilarityIndex(features, block=block)
+    for row in (0, 150, 299):
+        dist = ((index.matrix.astype("float64") - index.matrix[row]) ** 2).sum(axis=1)
+        dist[row] = np.inf
+        expected = np.argsort(dist, kind="stable")[:20]
+        found = index.nearest(row, 20)
+        assert row not in found
+        np.testing.assert_allclose(np.sort(dist[found]), dist[expected], rtol=1e-4)
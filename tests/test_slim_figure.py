@@ -0,0 +1,29 @@
+"""slim_figure: smaller payload, same chart."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboard_views import slim_figure
+
+
+def test_text_repeating_an_axis_is_dropped():
+    df = pd.DataFrame({"value": [1.234, 5.678, np.nan], "company": ["A", "B", "C"]})
+    fig = px.bar(df, x="value", y="company", orientation="h", text="value")
+    fig.update_traces(texttemplate="%{text:.2f}", hovertemplate="%{text:.1f}<extra></extra>")
+    trace = slim_figure(fig).data[0]
+
+    assert trace.text is None
+    assert trace.texttemplate == "%{x:.2f}"
+    assert trace.hovertemplate == "%{x:.1f}<extra></extra>"
+    assert trace.x.dtype == np.float32
+    assert trace.xaxis is None and trace.yaxis is None
+
+
+def test_other_text_is_kept():
+    x, y = np.array([1.0, 2.0]), np.array([3, 4])
+    fig = go.Figure([go.Bar(x=x, y=y, text=np.array([9.0, 8.0])), go.Bar(x=x, y=y, text=["a", "b"])])
+    labelled, named = slim_figure(fig).data
+    np.testing.assert_array_equal(labelled.text, [9.0, 8.0])
+    assert list(named.text) == ["a", "b"]
+    assert labelled.y.dtype == np.int32
@@ -0,0 +1,44 @@
+"""PublicationTimeline curves and counts against a brute-force count per group."""
+import numpy as np
+import pytest
+
+from dashboard_data import PublicationTimeline
+
+NUM_GROUPS = 4
+
+
+@pytest.fixture
+def timeline_data():
+    rng = np.random.default_rng(11)
+    days = rng.integers(0, 30, size=300)  # viele Berichte am selben Tag
+    days[rng.random(300) < 0.1] = -1      # ohne Datum
+    codes = rng.integers(0, NUM_GROUPS - 1, size=300)  # letzte Gruppe bleibt leer
+    codes[rng.random(300) < 0.05] = -1
+    return days, codes
+
+
+def _published(days, codes, code):
+    return days[(codes == code) & (days >= 0)]
+
+
+def test_curve_counts_reports_up_to_each_day(timeline_data):
+    days, codes = timeline_data
+    timeline = PublicationTimeline(days, codes, NUM_GROUPS)
+    for code in range(NUM_GROUPS):
+        group = _published(days, codes, code)
+        curve_days, counts = timeline.curve(code)
+        np.testing.assert_array_equal(curve_days, np.unique(group))
+        np.testing.assert_array_equal(counts, [(group <= d).sum() for d in curve_days])
+    assert len(timeline.curve(-1)[0]) == 0
+
+
+def test_published_by_and_before_match_brute_force(timeline_data):
+    days, codes = timeline_data
+    timeline = PublicationTimeline(days, codes, NUM_GROUPS)
+    probe = np.arange(-2, 33)
+    for code in range(NUM_GROUPS):
+        group = _published(days, codes, code)
+        np.testing.assert_array_equal(timeline.published_by(code, probe), [(group <= d).sum() for d in probe])
+        for day in (0, 15, 31):
+            assert timeline.published_before(code, day) == (group < day).sum()
+    assert timeline.published_before(NUM_GROUPS, 10) == 0
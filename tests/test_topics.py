@@ -0,0 +1,48 @@
+"""TopicMatrix group means and peer means against a direct nanmean."""
+import numpy as np
+
+from dashboard_data import ALL, ESRS_TOPICS, TopicMatrix
+
+GROUPS = ["x", "y", "z"]
+
+
+def _topics(frame):
+    rng = np.random.default_rng(5)
+    values = rng.random((len(frame), len(ESRS_TOPICS)))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:40] = 0.0  # berichten zu keinem Topic
+    values[40:45] = np.nan
+    codes = frame["group"].cat.codes.to_numpy()
+    categories = frame["group"].cat.categories
+    return values, codes, TopicMatrix(values, {"group": (codes, {g: c for c, g in enumerate(categories)})})
+
+
+def _nanmean(rows):
+    with np.errstate(invalid="ignore"):
+        return np.nanmean(rows, axis=0) if len(rows) else np.full(len(ESRS_TOPICS), np.nan)
+
+
+def test_group_means_ignore_missing_shares(frame):
+    values, codes, topics = _topics(frame)
+    means = topics.group_means("group")
+    for code, group in enumerate(means.index):
+        np.testing.assert_allclose(means.loc[group], _nanmean(values[codes == code]))
+    np.testing.assert_allclose(topics.group_means(ALL).loc[ALL], _nanmean(values))
+
+
+def test_peer_mean_uses_reporting_companies_without_the_focal(frame):
+    values, codes, topics = _topics(frame)
+    reporting = (np.nan_to_num(values) > 0).any(axis=1)
+    for group in GROUPS:
+        members = np.flatnonzero((codes == GROUPS.index(group)) & reporting)
+        np.testing.assert_allclose(topics.peer_mean("group", group), _nanmean(values[members]))
+        focal = members[0]
+        np.testing.assert_allclose(topics.peer_mean("group", group, exclude_row=focal),
+                                   _nanmean(values[members[1:]]))
+        # Firma ohne Topic-Daten zählt ohnehin nicht mit
+        silent = np.flatnonzero((codes == GROUPS.index(group)) & ~reporting)[0]
+        np.testing.assert_allclose(topics.peer_mean("group", group, exclude_row=silent),
+                                   topics.peer_mean("group", group))
+    assert np.isnan(topics.peer_mean("group", "unknown")).all()
+    # einziges Mitglied von "solo" ist Zeile 0, die nicht berichtet
+    assert np.isnan(topics.peer_mean("group", "solo")).all()